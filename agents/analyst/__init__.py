@@ -0,0 +1 @@
+# agents/analyst
@@ -0,0 +1,329 @@
+"""
+Citation Analyst Agent - Core Logic
+
+Compares each claim with the content of its cited source and produces an
+AnalysisResult. The LLM path packs several claim/source pairs into one
+completion request, runs requests with bounded concurrency and caches
+results; the TF-IDF path is used when no LLM is available, when a request
+is too slow or fails, and once the per-report call budget is spent.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from agents.common.models import AnalysisResult
+
+
+VERDICTS = ("supported", "contradicted", "unrelated", "insufficient_source")
+
+SYSTEM_PROMPT = (
+    "You check whether cited sources support the claims made about them. "
+    "For every numbered item, compare the claim with the source excerpt. "
+    "Reply with only a JSON array containing one object per item: "
+    '{"id": <item number>, "verdict": "supported" | "contradicted" | "unrelated" | '
+    '"insufficient_source", "confidence": <0-100>, "explanation": "<one sentence>"}.'
+)
+
+# Completion backend: (model, messages) -> response text
+CompletionFn = Callable[[str, List[dict]], Awaitable[str]]
+
+
+@dataclass
+class AnalysisRequest:
+    """A claim and the source content it cites."""
+    citation_id: str
+    claim: str
+    source: str
+
+
+@dataclass
+class AnalyzerStats:
+    """Counters for one or more analyze() calls."""
+    llm_calls: int = 0
+    llm_results: int = 0
+    cache_hits: int = 0
+    fallbacks: int = 0
+    prompt_tokens: int = 0  # Estimated
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+async def litellm_complete(
+    model: str,
+    messages: List[dict],
+    api_base: Optional[str] = None,
+) -> str:
+    """Default completion backend using litellm."""
+    import litellm
+
+    response = await litellm.acompletion(
+        model=model,
+        messages=messages,
+        api_base=api_base,
+        temperature=0,
+    )
+    return response.choices[0].message.content
+
+
+class TfidfAnalyzer:
+    """Scores claim/source pairs by TF-IDF cosine similarity."""
+
+    SUPPORTED_THRESHOLD = 0.3
+
+    def analyze(self, request: AnalysisRequest) -> AnalysisResult:
+        """Analyze one claim/source pair."""
+        return self.analyze_batch([request])[0]
+
+    def analyze_batch(self, requests: List[AnalysisRequest]) -> List[AnalysisResult]:
+        """Analyze several pairs; each is scored on its own, as in analyze()."""
+        scored = [i for i, request in enumerate(requests) if request.source and request.source.strip()]
+        similarities = dict(zip(scored, self._similarities([requests[i] for i in scored])))
+
+        results = []
+        for i, request in enumerate(requests):
+            if i not in similarities:
+                results.append(AnalysisResult(
+                    citation_id=request.citation_id,
+                    verdict="insufficient_source",
+                    confidence_score=0.0,
+                    analysis_mode="tfidf",
+                    explanation="No source content was available to compare against.",
+                ))
+                continue
+            similarity = similarities[i]
+            verdict = "supported" if similarity >= self.SUPPORTED_THRESHOLD else "unrelated"
+            results.append(AnalysisResult(
+                citation_id=request.citation_id,
+                verdict=verdict,
+                confidence_score=round(similarity * 100, 1),
+                analysis_mode="tfidf",
+                explanation=f"TF-IDF similarity between claim and source is {similarity:.2f}.",
+                content_similarity_score=similarity,
+            ))
+        return results
+
+    def _similarities(self, requests: List[AnalysisRequest]) -> List[float]:
+        """Cosine similarity of each claim with its source, fitted per pair."""
+        return [self._similarity(request.claim, request.source) for request in requests]
+
+    def _similarity(self, claim: str, source: str) -> float:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        try:
+            vectors = TfidfVectorizer(stop_words="english").fit_transform([claim, source])
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words)
+            return 0.0
+        return float(cosine_similarity(vectors[0], vectors[1])[0][0])
+
+
+class LLMAnalyzer:
+    """
+    Batched, cached LLM analysis with a TF-IDF fallback.
+
+    Pending pairs are packed greedily into requests of at most
+    `token_budget` estimated prompt tokens and `max_items` items. At most
+    `max_concurrency` requests run at once. Results are cached by a hash
+    of (model, prompt, source snippet), so re-analysing a resubmitted
+    document only sends what changed. A batch falls back to TF-IDF when
+    its request times out or fails, when the report's `max_calls` budget
+    is spent, or when the report deadline has passed.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        complete: Optional[CompletionFn] = None,
+        api_base: Optional[str] = None,
+        fallback: Optional[TfidfAnalyzer] = None,
+        token_budget: int = 3000,
+        max_items: int = 20,
+        max_concurrency: int = 4,
+        request_timeout: float = 30.0,
+        max_calls: Optional[int] = None,
+        max_source_chars: int = 1500,
+        cache_size: int = 4096,
+    ):
+        self.model = model
+        self.complete = complete or partial(litellm_complete, api_base=api_base)
+        self.fallback = fallback or TfidfAnalyzer()
+        self.token_budget = token_budget
+        self.max_items = max_items
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.max_calls = max_calls
+        self.max_source_chars = max_source_chars
+        self.cache_size = cache_size
+        self.stats = AnalyzerStats()
+        self._cache: "OrderedDict[str, AnalysisResult]" = OrderedDict()
+
+    async def analyze(
+        self,
+        requests: List[AnalysisRequest],
+        deadline: Optional[float] = None,
+    ) -> List[AnalysisResult]:
+        """
+        Analyze all claim/source pairs of a report.
+
+        Args:
+            requests: Pairs to analyze.
+            deadline: Seconds from now after which unsent batches use TF-IDF.
+
+        Returns:
+            One AnalysisResult per request, in the same order.
+        """
+        results: Dict[int, AnalysisResult] = {}
+        # Identical pairs share one cache key and are sent once
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        for index, request in enumerate(requests):
+            key = self._cache_key(request)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats.cache_hits += 1
+                results[index] = cached.model_copy(update={"citation_id": request.citation_id})
+            else:
+                pending.setdefault(key, []).append(index)
+
+        ends_at = None if deadline is None else time.monotonic() + deadline
+        calls_left = self.max_calls
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(batch: List[Tuple[str, AnalysisRequest]]):
+            nonlocal calls_left
+            async with semaphore:
+                timeout = self.request_timeout
+                if ends_at is not None:
+                    timeout = min(timeout, ends_at - time.monotonic())
+                if timeout <= 0 or calls_left == 0:
+                    timeout = None
+                elif calls_left is not None:
+                    calls_left -= 1
+                analyzed = await self._call_llm(batch, timeout) if timeout is not None else {}
+            missing = [(key, request) for key, request in batch if key not in analyzed]
+            if missing:
+                # CPU-bound; keep it off the event loop and out of the LLM slots
+                self.stats.fallbacks += len(missing)
+                fallbacks = await asyncio.to_thread(
+                    self.fallback.analyze_batch, [request for _, request in missing]
+                )
+                analyzed.update(zip((key for key, _ in missing), fallbacks))
+            for key, _ in batch:
+                for index in pending[key]:
+                    results[index] = analyzed[key].model_copy(
+                        update={"citation_id": requests[index].citation_id}
+                    )
+
+        unique = [(key, requests[indices[0]]) for key, indices in pending.items()]
+        await asyncio.gather(*(run(batch) for batch in self._pack(unique)))
+        return [results[i] for i in range(len(requests))]
+
+    def _pack(self, items: List[Tuple[str, AnalysisRequest]]) -> List[List[Tuple[str, AnalysisRequest]]]:
+        """Greedily pack items into batches under the token budget."""
+        batches: List[List[Tuple[str, AnalysisRequest]]] = []
+        current: List[Tuple[str, AnalysisRequest]] = []
+        used = estimate_tokens(SYSTEM_PROMPT)
+        for key, request in items:
+            cost = estimate_tokens(self._format_item(0, request))
+            if current and (used + cost > self.token_budget or len(current) >= self.max_items):
+                batches.append(current)
+                current, used = [], estimate_tokens(SYSTEM_PROMPT)
+            current.append((key, request))
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _call_llm(
+        self,
+        batch: List[Tuple[str, AnalysisRequest]],
+        timeout: float,
+    ) -> Dict[str, AnalysisResult]:
+        """
+        Analyze one batch with a single LLM call.
+
+        Items missing from the result need the TF-IDF fallback.
+        """
+        prompt = "\n".join(self._format_item(i, request) for i, (_, request) in enumerate(batch))
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        self.stats.llm_calls += 1
+        self.stats.prompt_tokens += estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+        try:
+            reply = await asyncio.wait_for(self.complete(self.model, messages), timeout)
+            analyzed = self._parse_reply(reply, batch)
+        except Exception:
+            # Timeouts, transport and provider errors all fall back to TF-IDF
+            analyzed = {}
+        for key, result in analyzed.items():
+            self._remember(key, result)
+        self.stats.llm_results += len(analyzed)
+        return analyzed
+
+    def _parse_reply(
+        self,
+        reply: str,
+        batch: List[Tuple[str, AnalysisRequest]],
+    ) -> Dict[str, AnalysisResult]:
+        """Map a JSON array reply back onto the batch; invalid entries are skipped."""
+        match = re.search(r"\[.*\]", reply or "", re.DOTALL)
+        if not match:
+            return {}
+        try:
+            entries = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+
+        analyzed: Dict[str, AnalysisResult] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get("id")
+            if not isinstance(index, int) or not 0 <= index < len(batch):
+                continue
+            if entry.get("verdict") not in VERDICTS:
+                continue
+            try:
+                confidence = min(100.0, max(0.0, float(entry.get("confidence", 0))))
+            except (TypeError, ValueError):
+                continue
+            key, request = batch[index]
+            analyzed[key] = AnalysisResult(
+                citation_id=request.citation_id,
+                verdict=entry["verdict"],
+                confidence_score=confidence,
+                analysis_mode="llm",
+                explanation=entry.get("explanation"),
+            )
+        return analyzed
+
+    def _format_item(self, index: int, request: AnalysisRequest) -> str:
+        source = request.source[:self.max_source_chars]
+        return f"### Item {index}\nClaim: {request.claim}\nSource: {source}\n"
+
+    def _cache_key(self, request: AnalysisRequest) -> str:
+        """Hash of (model, prompt, source snippet)."""
+        payload = json.dumps([
+            self.model,
+            SYSTEM_PROMPT,
+            request.claim,
+            request.source[:self.max_source_chars],
+        ])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _remember(self, key: str, result: AnalysisResult) -> None:
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
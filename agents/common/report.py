@@ -0,0 +1,140 @@
+"""
+Progressive HallucinationReport aggregation.
+
+Builds the report incrementally as AnalysisResults arrive, so partial
+reports can be queried and streamed before the slowest lookup finishes.
+"""
+import threading
+import time
+from typing import Dict, List, Literal, Optional, Tuple
+from agents.common.models import AnalysisResult, Citation, HallucinationReport
+
+
+# Verdicts counted towards verified_count / flagged_count
+VERIFIED_VERDICTS = frozenset({"supported"})
+FLAGGED_VERDICTS = frozenset({"contradicted", "unrelated"})
+
+
+class ReportAggregator:
+    """
+    Running aggregate of a HallucinationReport.
+
+    Counters and the overall score are updated in O(1) per result; a
+    result re-submitted for the same citation replaces the earlier one.
+    Every accepted result is also appended to an event log that
+    subscribers (e.g. the Server-Sent Events endpoint) can wait on.
+    """
+
+    def __init__(
+        self,
+        citations: Optional[List[Citation]] = None,
+        analysis_mode: Literal["llm", "tfidf"] = "tfidf",
+    ):
+        self.default_mode = analysis_mode
+        self.citations: List[Citation] = []
+        self.citations_by_id: Dict[str, Citation] = {}
+        self.results: Dict[str, AnalysisResult] = {}
+        self.verified_count = 0
+        self.flagged_count = 0
+        self.complete = False
+        self.closed_at: Optional[float] = None  # time.monotonic() when closed
+        self._score_total = 0.0
+        self._mode_counts = {"llm": 0, "tfidf": 0}
+        self._events: List[AnalysisResult] = []
+        self._cond = threading.Condition()
+        if citations:
+            self.set_citations(citations)
+
+    @property
+    def total_citations(self) -> int:
+        return len(self.citations)
+
+    @property
+    def overall_score(self) -> float:
+        """Mean confidence over the results received so far."""
+        if not self.results:
+            return 0.0
+        return round(self._score_total / len(self.results), 1)
+
+    @property
+    def analysis_mode(self) -> Literal["llm", "tfidf"]:
+        """The analysis method used by most results so far."""
+        llm, tfidf = self._mode_counts["llm"], self._mode_counts["tfidf"]
+        if llm == tfidf:
+            return self.default_mode
+        return "llm" if llm > tfidf else "tfidf"
+
+    def set_citations(self, citations: List[Citation]) -> None:
+        """Record the parsed citations once the parser has finished."""
+        with self._cond:
+            self.citations = list(citations)
+            self.citations_by_id = {c.id: c for c in self.citations}
+            self._cond.notify_all()
+
+    def add(self, result: AnalysisResult) -> None:
+        """Fold a result into the running aggregate and notify subscribers."""
+        with self._cond:
+            previous = self.results.get(result.citation_id)
+            if previous is not None:
+                self._apply(previous, -1)
+            self.results[result.citation_id] = result
+            self._apply(result, 1)
+            self._events.append(result)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Mark the report as complete."""
+        with self._cond:
+            if not self.complete:
+                self.complete = True
+                self.closed_at = time.monotonic()
+            self._cond.notify_all()
+
+    def wait(self, since: int, timeout: Optional[float] = None) -> Tuple[List[AnalysisResult], bool]:
+        """
+        Return results received after event index `since`.
+
+        Blocks until there is at least one new result, the report is
+        complete, or the timeout expires.
+
+        Returns:
+            Tuple of (new results, whether the report is complete).
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._events) > since or self.complete, timeout)
+            return self._events[since:], self.complete
+
+    def progress(self) -> dict:
+        """Running counters for status updates."""
+        with self._cond:
+            return {
+                "overall_score": self.overall_score,
+                "total_citations": self.total_citations,
+                "analyzed_count": len(self.results),
+                "verified_count": self.verified_count,
+                "flagged_count": self.flagged_count,
+                "analysis_mode": self.analysis_mode,
+                "complete": self.complete,
+            }
+
+    def snapshot(self) -> HallucinationReport:
+        """Build a HallucinationReport from the results received so far."""
+        with self._cond:
+            return HallucinationReport(
+                overall_score=self.overall_score,
+                total_citations=self.total_citations,
+                verified_count=self.verified_count,
+                flagged_count=self.flagged_count,
+                analysis_mode=self.analysis_mode,
+                citations=list(self.citations),
+                results=dict(self.results),
+            )
+
+    def _apply(self, result: AnalysisResult, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a result's contribution."""
+        self._score_total += sign * result.confidence_score
+        self._mode_counts[result.analysis_mode] += sign
+        if result.verdict in VERIFIED_VERDICTS:
+            self.verified_count += sign
+        elif result.verdict in FLAGGED_VERDICTS:
+            self.flagged_count += sign
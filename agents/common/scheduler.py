@@ -0,0 +1,259 @@
+"""
+Verification workload scheduler.
+
+Sits between the web front end and the verify/analyze stages and decides
+which citation lookup runs next:
+  - tenants take turns (round robin per lookup), so one large submission
+    cannot starve everyone else
+  - within a tenant, jobs with fewer citations go first
+  - jobs past their deadline, or no longer watched by a client, are
+    cancelled and their queued lookups dropped
+  - at most `max_outstanding` remote lookups run at any time
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+
+JobState = Literal["queued", "running", "done", "cancelled"]
+
+
+@dataclass
+class Job:
+    """A verification job: one submission's citations to look up."""
+    job_id: str
+    tenant: str
+    items: List[Any]
+    submitted_at: float
+    deadline: Optional[float] = None  # Absolute time on the scheduler clock
+    state: JobState = "queued"
+    cancel_reason: Optional[str] = None
+    dispatched: int = 0  # Lookups handed out so far
+    completed: int = 0  # Lookups finished so far
+    last_seen: float = 0.0  # Last time a client asked about this job
+    finished_at: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.items)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.state == "cancelled"
+
+
+class VerificationScheduler:
+    """
+    Fair, short-job-first scheduler for citation lookups.
+
+    Workers call acquire() to get the next (job, item) to look up and
+    release() when the lookup is done. The scheduler never runs lookups
+    itself, so the same policy drives worker threads and simulations
+    (pass a virtual `clock`).
+
+    Jobs that still have lookups to dispatch are cancelled once their
+    deadline passes or no client has touched them for `abandon_after`
+    seconds; `on_cancel` is then called with the job (outside the lock),
+    e.g. to close its report. Finished and cancelled jobs are dropped
+    from `jobs`.
+    """
+
+    def __init__(
+        self,
+        max_outstanding: int = 32,
+        abandon_after: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_cancel: Optional[Callable[[Job], None]] = None,
+    ):
+        self.max_outstanding = max_outstanding
+        self.abandon_after = abandon_after
+        self.clock = clock
+        self.on_cancel = on_cancel
+        self.jobs: Dict[str, Job] = {}  # Jobs not yet done or cancelled
+        self.outstanding = 0
+        # Per tenant: heap of (size, seq, job) with lookups still to dispatch
+        self._tenants: "OrderedDict[str, List[Tuple[int, int, Job]]]" = OrderedDict()
+        # (expires_at, seq, job) for jobs that can expire; touched jobs are re-queued lazily
+        self._expiry: List[Tuple[float, int, Job]] = []
+        self._cancelled: List[Job] = []  # Waiting for on_cancel
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def submit(
+        self,
+        job_id: str,
+        tenant: str,
+        items: List[Any],
+        deadline: Optional[float] = None,
+    ) -> Job:
+        """
+        Queue a job once the parser has produced its citations.
+
+        Args:
+            job_id: Task ID of the submission.
+            tenant: Who submitted it (user, session or client address).
+            items: Work items, one per lookup (usually Citations).
+            deadline: Seconds from now after which the job is cancelled.
+        """
+        with self._cond:
+            now = self.clock()
+            job = Job(
+                job_id=job_id,
+                tenant=tenant,
+                items=list(items),
+                submitted_at=now,
+                deadline=now + deadline if deadline is not None else None,
+                last_seen=now,
+            )
+            if not job.items:
+                self._finish(job, now)
+                return job
+            self.jobs[job_id] = job
+            heapq.heappush(self._tenants.setdefault(tenant, []), (job.size, next(self._seq), job))
+            expires_at = self._expires_at(job)
+            if expires_at is not None:
+                heapq.heappush(self._expiry, (expires_at, next(self._seq), job))
+            self._cond.notify_all()
+            return job
+
+    def touch(self, job_id: str) -> None:
+        """Record that a client is still waiting for this job."""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                job.last_seen = self.clock()
+
+    def cancel(self, job_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a job; queued lookups are dropped, running ones finish."""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is not None:
+                self._cancel(job, self.clock(), reason)
+                self._cond.notify_all()
+        self._notify_cancelled()
+        return job is not None
+
+    def next_lookup(self) -> Optional[Tuple[Job, Any]]:
+        """
+        Return the next lookup to run, or None if none can start now.
+
+        Non-blocking; takes one of the `max_outstanding` slots.
+        """
+        with self._cond:
+            lookup = self._next_lookup()
+        self._notify_cancelled()
+        return lookup
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[Tuple[Job, Any]]:
+        """Block until a lookup can start; returns None on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                lookup = self._next_lookup()
+                remaining = None if end is None else end - time.monotonic()
+                if lookup is None and not self._cancelled and (remaining is None or remaining > 0):
+                    # Wake up for the next expiry too, so it is swept on time
+                    if self._expiry:
+                        until = max(0.0, self._expiry[0][0] - self.clock())
+                        remaining = until if remaining is None else min(remaining, until)
+                    self._cond.wait(remaining)
+                    remaining = None if end is None else end - time.monotonic()
+            self._notify_cancelled()
+            if lookup is not None or (remaining is not None and remaining <= 0):
+                return lookup
+
+    def release(self, job: Job) -> None:
+        """Mark one lookup of a job as finished and free its slot."""
+        with self._cond:
+            self.outstanding -= 1
+            job.completed += 1
+            if job.completed == job.size and job.state == "running":
+                self._finish(job, self.clock())
+            self._cond.notify_all()
+
+    def pending_jobs(self) -> int:
+        """Number of jobs that still have lookups to dispatch."""
+        with self._cond:
+            return sum(
+                1 for queue in self._tenants.values()
+                for _, _, job in queue if not job.cancelled
+            )
+
+    def _next_lookup(self) -> Optional[Tuple[Job, Any]]:
+        """next_lookup() with the lock held."""
+        now = self.clock()
+        self._expire(now)
+        if self.outstanding >= self.max_outstanding:
+            return None
+        while self._tenants:
+            tenant, queue = next(iter(self._tenants.items()))
+            job = self._next_job(queue)
+            if job is None:
+                del self._tenants[tenant]
+                continue
+            # Serve one lookup, then move the tenant to the back of the line
+            self._tenants.move_to_end(tenant)
+            item = job.items[job.dispatched]
+            job.dispatched += 1
+            job.state = "running"
+            if job.dispatched == job.size:
+                heapq.heappop(queue)
+            self.outstanding += 1
+            return job, item
+        return None
+
+    def _next_job(self, queue: List[Tuple[int, int, Job]]) -> Optional[Job]:
+        """Smallest live job in a tenant's queue, dropping cancelled ones."""
+        while queue:
+            job = queue[0][2]
+            if not job.cancelled:
+                return job
+            heapq.heappop(queue)
+        return None
+
+    def _expire(self, now: float) -> None:
+        """Cancel every job with lookups left whose deadline or watch timeout has passed."""
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, job = heapq.heappop(self._expiry)
+            if job.cancelled or job.dispatched == job.size:
+                continue
+            expires_at = self._expires_at(job)
+            if expires_at > now:
+                # Touched since it was queued
+                heapq.heappush(self._expiry, (expires_at, next(self._seq), job))
+            elif job.deadline is not None and now >= job.deadline:
+                self._cancel(job, now, "deadline exceeded")
+            else:
+                self._cancel(job, now, "abandoned")
+
+    def _expires_at(self, job: Job) -> Optional[float]:
+        """When a job with lookups left is cancelled, or None if never."""
+        times = [job.deadline]
+        if self.abandon_after is not None:
+            times.append(job.last_seen + self.abandon_after)
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    def _notify_cancelled(self) -> None:
+        """Pass jobs cancelled since the last call to on_cancel, outside the lock."""
+        with self._cond:
+            cancelled, self._cancelled = self._cancelled, []
+        if self.on_cancel is not None:
+            for job in cancelled:
+                self.on_cancel(job)
+
+    def _cancel(self, job: Job, now: float, reason: str) -> None:
+        job.state = "cancelled"
+        job.cancel_reason = reason
+        job.finished_at = now
+        self.jobs.pop(job.job_id, None)
+        self._cancelled.append(job)
+
+    def _finish(self, job: Job, now: float) -> None:
+        job.state = "done"
+        job.finished_at = now
+        self.jobs.pop(job.job_id, None)
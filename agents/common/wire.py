@@ -0,0 +1,289 @@
+"""
+Wire formats for citation payloads.
+
+The parser's A2A response carries its citations as a DataPart. Clients can
+ask for a more compact format by listing accepted format tokens, most
+preferred first, in the message metadata under "accept". A token is
+`<encoding>[+<serialization>][+<compression>]`:
+
+  encoding       full (one model_dump() per citation, the default),
+                 compact (rows without null fields),
+                 columnar (field -> array of values, all-null fields dropped)
+  serialization  json (default) or msgpack
+  compression    gzip or zstd
+
+compact and columnar also deduplicate context: overlapping context windows
+are merged into shared "segments" and each citation refers to its slice as
+[segment, offset, length]. Anything beyond plain JSON is sent as a base64
+payload inside the DataPart. msgpack and zstd are optional dependencies and
+are only advertised when installed.
+"""
+import base64
+import gzip
+import importlib.util
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from agents.common.models import Citation
+
+
+MEDIA_TYPE_PREFIX = "application/vnd.citation-verifier."
+
+ENCODINGS = ("full", "compact", "columnar")
+SERIALIZATIONS = ("json", "msgpack")
+COMPRESSIONS = ("gzip", "zstd")
+
+CITATION_FIELDS = list(Citation.model_fields)
+
+
+@dataclass(frozen=True)
+class WireFormat:
+    """A negotiated citation payload format."""
+    encoding: str = "full"
+    serialization: str = "json"
+    compression: Optional[str] = None
+
+    @property
+    def token(self) -> str:
+        parts = [self.encoding]
+        if self.serialization != "json":
+            parts.append(self.serialization)
+        if self.compression:
+            parts.append(self.compression)
+        return "+".join(parts)
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPE_PREFIX + self.token
+
+    @classmethod
+    def parse(cls, token: str) -> Optional["WireFormat"]:
+        """Parse a token or media type; None if it is not a valid format."""
+        if token.startswith(MEDIA_TYPE_PREFIX):
+            token = token[len(MEDIA_TYPE_PREFIX):]
+        encoding, *rest = token.strip().split("+")
+        if encoding not in ENCODINGS:
+            return None
+        serialization, compression = "json", None
+        for part in rest:
+            if part in SERIALIZATIONS:
+                serialization = part
+            elif part in COMPRESSIONS:
+                compression = part
+            else:
+                return None
+        return cls(encoding, serialization, compression)
+
+    def is_available(self) -> bool:
+        """Whether the optional libraries this format needs are installed."""
+        if self.serialization == "msgpack" and not _has_module("msgpack"):
+            return False
+        if self.compression == "zstd" and not _has_module("zstandard"):
+            return False
+        return True
+
+
+DEFAULT_FORMAT = WireFormat()
+
+
+def supported_formats() -> List[WireFormat]:
+    """Every format this installation can produce, for the agent card."""
+    formats = [
+        WireFormat(encoding, serialization, compression)
+        for encoding in ENCODINGS
+        for serialization in SERIALIZATIONS
+        for compression in (None,) + COMPRESSIONS
+    ]
+    return [f for f in formats if f.is_available()]
+
+
+def negotiate(accept: Optional[Sequence[str]]) -> WireFormat:
+    """
+    Pick the first accepted format that is available, else full JSON.
+
+    `accept` comes from client metadata: anything but a list of strings
+    is ignored, as are entries that are not strings.
+    """
+    if not isinstance(accept, (list, tuple)):
+        return DEFAULT_FORMAT
+    for token in accept:
+        if not isinstance(token, str):
+            continue
+        wire_format = WireFormat.parse(token)
+        if wire_format is not None and wire_format.is_available():
+            return wire_format
+    return DEFAULT_FORMAT
+
+
+def encode_citations(
+    citations: List[Citation],
+    wire_format: WireFormat = DEFAULT_FORMAT,
+    text: Optional[str] = None,
+    context_bounds: Optional[Dict[str, Tuple[int, int]]] = None,
+) -> dict:
+    """
+    Encode citations as DataPart data.
+
+    Args:
+        citations: Citations to send.
+        wire_format: Negotiated format.
+        text: Source text the citations were parsed from.
+        context_bounds: citation_id -> (start, end) of its context in text;
+            enables context deduplication for compact/columnar.
+
+    Returns:
+        A JSON-serializable dict.
+    """
+    if wire_format.encoding == "full":
+        body = {"citations": [c.model_dump(mode="json") for c in citations]}
+    else:
+        contexts, segments = _dedup_contexts(citations, text, context_bounds)
+        if wire_format.encoding == "compact":
+            body = {"encoding": "compact", "citations": _rows(citations, contexts)}
+        else:
+            body = {"encoding": "columnar", "count": len(citations), "columns": _columns(citations, contexts)}
+        if segments:
+            body["segments"] = segments
+
+    if wire_format.serialization == "json" and wire_format.compression is None:
+        return body
+
+    raw = _serialize(body, wire_format.serialization)
+    if wire_format.compression:
+        raw = _compress(raw, wire_format.compression)
+    return {
+        "format": wire_format.token,
+        "payload": base64.b64encode(raw).decode("ascii"),
+    }
+
+
+def decode_citations(data: dict) -> List[Citation]:
+    """Decode DataPart data produced by encode_citations (any format)."""
+    if "payload" in data:
+        wire_format = WireFormat.parse(data["format"])
+        if wire_format is None:
+            raise ValueError(f"Unknown citation wire format: {data['format']}")
+        raw = base64.b64decode(data["payload"])
+        if wire_format.compression:
+            raw = _decompress(raw, wire_format.compression)
+        data = _deserialize(raw, wire_format.serialization)
+
+    encoding = data.get("encoding", "full")
+    if encoding == "full":
+        return [Citation(**c) for c in data["citations"]]
+
+    segments = data.get("segments", [])
+    if encoding == "compact":
+        rows = data["citations"]
+    elif encoding == "columnar":
+        columns = data["columns"]
+        rows = [
+            {name: values[i] for name, values in columns.items() if values[i] is not None}
+            for i in range(data["count"])
+        ]
+    else:
+        raise ValueError(f"Unknown citation encoding: {encoding}")
+
+    citations = []
+    for row in rows:
+        context = row.get("context")
+        if isinstance(context, list):
+            segment, offset, length = context
+            row = {**row, "context": segments[segment][offset:offset + length]}
+        citations.append(Citation(**row))
+    return citations
+
+
+def _dedup_contexts(
+    citations: List[Citation],
+    text: Optional[str],
+    context_bounds: Optional[Dict[str, Tuple[int, int]]],
+) -> Tuple[List[object], List[str]]:
+    """
+    Replace contexts with [segment, offset, length] references.
+
+    Overlapping or touching context windows are merged into one segment.
+    Citations without known bounds keep their context string.
+    """
+    contexts: List[object] = [c.context for c in citations]
+    if not text or not context_bounds:
+        return contexts, []
+
+    bounds = []
+    for i, citation in enumerate(citations):
+        span = context_bounds.get(citation.id)
+        if citation.context and span and text[span[0]:span[1]] == citation.context:
+            bounds.append((span[0], span[1], i))
+    if not bounds:
+        return contexts, []
+
+    bounds.sort()
+    segments: List[str] = []
+    seg_start, seg_end = bounds[0][0], bounds[0][1]
+    members: List[Tuple[int, int, int]] = []
+
+    def flush():
+        segments.append(text[seg_start:seg_end])
+        for start, end, i in members:
+            contexts[i] = [len(segments) - 1, start - seg_start, end - start]
+
+    for start, end, i in bounds:
+        if start > seg_end:
+            flush()
+            seg_start, seg_end, members = start, end, []
+        seg_end = max(seg_end, end)
+        members.append((start, end, i))
+    flush()
+    return contexts, segments
+
+
+def _rows(citations: List[Citation], contexts: List[object]) -> List[dict]:
+    rows = []
+    for citation, context in zip(citations, contexts):
+        row = {k: v for k, v in citation.model_dump(mode="json").items() if v is not None}
+        if context is not None:
+            row["context"] = context
+        rows.append(row)
+    return rows
+
+
+def _columns(citations: List[Citation], contexts: List[object]) -> Dict[str, list]:
+    dumped = [c.model_dump(mode="json") for c in citations]
+    columns = {}
+    for name in CITATION_FIELDS:
+        values = contexts if name == "context" else [d[name] for d in dumped]
+        if any(v is not None for v in values):
+            columns[name] = list(values)
+    return columns
+
+
+def _serialize(body: dict, serialization: str) -> bytes:
+    if serialization == "msgpack":
+        import msgpack
+        return msgpack.packb(body, use_bin_type=True)
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(raw: bytes, serialization: str) -> dict:
+    if serialization == "msgpack":
+        import msgpack
+        return msgpack.unpackb(raw, raw=False)
+    return json.loads(raw)
+
+
+def _compress(raw: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().compress(raw)
+    return gzip.compress(raw, compresslevel=6)
+
+
+def _decompress(raw: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(raw)
+    return gzip.decompress(raw)
+
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
@@ -6,10 +6,34 @@ Supports DOI, URL, ISBN, and common citation formats (APA, MLA).
 """
 import re
 import uuid
-from typing import List, Optional
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Tuple
 from agents.common.models import Citation, CitationType
 
 
+# Characters of surrounding text kept as a citation's context on each side
+CONTEXT_WINDOW = 100
+
+
+@dataclass(slots=True)
+class CitationSpan:
+    """A single pattern match in the source text."""
+    type: CitationType
+    start: int
+    end: int
+    raw_text: str
+    key: Optional[str]  # Dedup key; None for matches that are not citations
+    groups: Tuple[Optional[str], ...] = ()
+    citation: Optional[Citation] = None  # Set when this span produced a citation
+
+    def shifted(self, delta: int) -> "CitationSpan":
+        """Return a copy of this span moved by delta characters."""
+        return CitationSpan(
+            self.type, self.start + delta, self.end + delta,
+            self.raw_text, self.key, self.groups, self.citation,
+        )
+
+
 class ParserAgent:
     """Parses text to extract citations."""
 
@@ -39,6 +63,9 @@ class ParserAgent:
     # Year in parentheses: (Author, Year) or (Year)
     YEAR_PATTERN = re.compile(r'\((\d{4})\)')
 
+    # Citation types in extraction order; earlier types win on duplicate keys
+    SCAN_ORDER = (CitationType.DOI, CitationType.URL, CitationType.ISBN, CitationType.PAPER)
+
     def parse(self, text: str) -> List[Citation]:
         """
         Parse text and extract all citations.
@@ -49,73 +76,138 @@ class ParserAgent:
         Returns:
             List of Citation objects.
         """
-        citations: List[Citation] = []
+        spans = {kind: list(self.scan(text, kind)) for kind in self.SCAN_ORDER}
+        return [span.citation for span in self.resolve(text, spans) if span.citation]
+
+    def scan(
+        self,
+        text: str,
+        kind: CitationType,
+        pos: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[CitationSpan]:
+        """
+        Yield every match of one citation type, in order, starting at pos.
+
+        Matches that are not citations (e.g. DOI URLs seen by the URL
+        pattern) are still yielded with key=None so callers can track
+        where the regex resumes scanning.
+
+        With a limit, only matches starting before it are yielded. Start
+        positions from limit on are never tried, so the cost stays bounded
+        by limit - pos even when no further match exists in the text.
+        """
+        pattern = self._pattern_for(kind)
+        if limit is None:
+            matches = pattern.finditer(text, pos)
+        else:
+            matches = self._matches_before(pattern, text, pos, limit)
+        for match in matches:
+            yield CitationSpan(
+                type=kind,
+                start=match.start(),
+                end=match.end(),
+                raw_text=match.group(0),
+                key=self._key_for(kind, match),
+                groups=match.groups(),
+            )
+
+    def resolve(
+        self,
+        text: str,
+        spans: Dict[CitationType, List[CitationSpan]],
+    ) -> List[CitationSpan]:
+        """
+        Attach citations to spans, keeping only the first match per key.
+
+        Spans that already carry a citation keep it (and its ID); others
+        get a freshly built one. Returns the spans in citation order.
+        """
+        resolved: List[CitationSpan] = []
         seen_ids = set()  # Track unique citations
-        
-        # Extract DOIs
-        for match in self.DOI_PATTERN.finditer(text):
-            doi = match.group(1).rstrip('.,;')
-            if doi not in seen_ids:
-                seen_ids.add(doi)
-                citations.append(Citation(
-                    id=str(uuid.uuid4())[:8],
-                    type=CitationType.DOI,
-                    raw_text=match.group(0),
-                    doi=doi,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-        
-        # Extract URLs (excluding DOI URLs already captured)
-        for match in self.URL_PATTERN.finditer(text):
+        for kind in self.SCAN_ORDER:
+            for span in spans.get(kind, []):
+                if span.key is None or span.key in seen_ids:
+                    continue
+                seen_ids.add(span.key)
+                if span.citation is None:
+                    span = replace(span, citation=self._build_citation(text, span))
+                resolved.append(span)
+        return resolved
+
+    def _matches_before(
+        self,
+        pattern: "re.Pattern[str]",
+        text: str,
+        pos: int,
+        limit: int,
+    ) -> Iterator["re.Match[str]"]:
+        """Same matches as pattern.finditer(text, pos), restricted to starts before limit."""
+        while pos < limit:
+            match = pattern.match(text, pos)
+            if match is None:
+                pos += 1
+            else:
+                yield match
+                pos = max(match.end(), pos + 1)
+
+    def _pattern_for(self, kind: CitationType) -> "re.Pattern[str]":
+        """Return the regex used to extract a citation type."""
+        return {
+            CitationType.DOI: self.DOI_PATTERN,
+            CitationType.URL: self.URL_PATTERN,
+            CitationType.ISBN: self.ISBN_PATTERN,
+            CitationType.PAPER: self.APA_PATTERN,
+        }[kind]
+
+    def _key_for(self, kind: CitationType, match: "re.Match[str]") -> Optional[str]:
+        """Return the dedup key for a match, or None if it is not a citation."""
+        if kind == CitationType.DOI:
+            return match.group(1).rstrip('.,;')
+        if kind == CitationType.URL:
             url = match.group(0).rstrip('.,;)')
-            if 'doi.org' not in url and url not in seen_ids:
-                seen_ids.add(url)
-                citations.append(Citation(
-                    id=str(uuid.uuid4())[:8],
-                    type=CitationType.URL,
-                    raw_text=match.group(0),
-                    url=url,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-        
-        # Extract ISBNs
-        for match in self.ISBN_PATTERN.finditer(text):
-            isbn = match.group(1).replace('-', '').replace(' ', '')
-            if isbn not in seen_ids:
-                seen_ids.add(isbn)
-                citations.append(Citation(
-                    id=str(uuid.uuid4())[:8],
-                    type=CitationType.ISBN,
-                    raw_text=match.group(0),
-                    isbn=isbn,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-        
-        # Extract APA-style citations
-        for match in self.APA_PATTERN.finditer(text):
-            raw = match.group(0)
-            if raw not in seen_ids:
-                seen_ids.add(raw)
-                authors = self._parse_authors(match.group(1))
-                year = int(match.group(2))
-                title = match.group(3).strip()
-                citations.append(Citation(
-                    id=str(uuid.uuid4())[:8],
-                    type=CitationType.PAPER,
-                    raw_text=raw,
-                    title=title,
-                    authors=authors,
-                    year=year,
-                    context=self._get_context(text, match.start(), match.end())
-                ))
-        
-        return citations
+            # DOI URLs are already captured by the DOI pattern
+            return None if 'doi.org' in url else url
+        if kind == CitationType.ISBN:
+            return match.group(1).replace('-', '').replace(' ', '')
+        return match.group(0)
+
+    def _build_citation(self, text: str, span: CitationSpan) -> Citation:
+        """Build a Citation for a span using its surrounding text."""
+        fields = {}
+        if span.type == CitationType.DOI:
+            fields["doi"] = span.key
+        elif span.type == CitationType.URL:
+            fields["url"] = span.key
+        elif span.type == CitationType.ISBN:
+            fields["isbn"] = span.key
+        else:
+            authors, year, title = span.groups
+            fields["authors"] = self._parse_authors(authors)
+            fields["year"] = int(year)
+            fields["title"] = title.strip()
+        return Citation(
+            id=str(uuid.uuid4())[:8],
+            type=span.type,
+            raw_text=span.raw_text,
+            context=self._get_context(text, span.start, span.end),
+            **fields
+        )
 
-    def _get_context(self, text: str, start: int, end: int, window: int = 100) -> str:
+    def _get_context(self, text: str, start: int, end: int, window: int = CONTEXT_WINDOW) -> str:
         """Extract surrounding context for a citation."""
+        ctx_start, ctx_end = self.context_bounds(text, start, end, window)
+        return text[ctx_start:ctx_end]
+
+    def context_bounds(self, text: str, start: int, end: int, window: int = CONTEXT_WINDOW) -> Tuple[int, int]:
+        """Offsets of the (whitespace-stripped) context around a match."""
         ctx_start = max(0, start - window)
         ctx_end = min(len(text), end + window)
-        return text[ctx_start:ctx_end].strip()
+        while ctx_start < ctx_end and text[ctx_start].isspace():
+            ctx_start += 1
+        while ctx_end > ctx_start and text[ctx_end - 1].isspace():
+            ctx_end -= 1
+        return ctx_start, ctx_end
 
     def _parse_authors(self, author_str: str) -> List[str]:
         """Parse author string into list of names."""
@@ -4,6 +4,7 @@ Parser Agent - A2A Protocol Bridge (Agent Executor)
 Handles incoming A2A requests and bridges them to the ParserAgent logic.
 """
 import json
+from collections import OrderedDict
 from typing import AsyncIterator
 from a2a.types import (
     Message,
@@ -16,7 +17,9 @@ from a2a.types import (
     Artifact,
 )
 from agents.parser.agent import ParserAgent
+from agents.parser.incremental import IncrementalParser, ParsedDocument
 from agents.common.models import Citation
+from agents.common.wire import encode_citations, negotiate
 
 
 class ParserAgentExecutor:
@@ -25,10 +28,20 @@ class ParserAgentExecutor:
     
     Receives text via A2A messages, invokes ParserAgent.parse(),
     and returns structured citations as A2A response.
+
+    Resubmissions within the same A2A context are parsed incrementally
+    against the previous version, so unchanged citations keep their IDs.
+    Clients can request a compact citation payload by listing accepted
+    wire formats under "accept" in the message metadata.
     """
+
+    # Number of previous documents kept for incremental re-parsing
+    MAX_DOCUMENTS = 128
     
     def __init__(self):
         self.agent = ParserAgent()
+        self.incremental = IncrementalParser(self.agent)
+        self.documents: OrderedDict[str, ParsedDocument] = OrderedDict()
 
     async def execute(
         self,
@@ -61,15 +74,22 @@ class ParserAgentExecutor:
         
         try:
             # Parse the citations
-            citations: list[Citation] = self.agent.parse(text_to_parse)
+            document = self._parse(text_to_parse, message)
+            citations: list[Citation] = document.citations
             
-            # Convert to JSON-serializable format
-            citations_data = [c.model_dump() for c in citations]
+            # Convert to the wire format the client accepts
+            metadata = getattr(message, "metadata", None) or {}
+            citations_data = encode_citations(
+                citations,
+                negotiate(metadata.get("accept")),
+                text=document.text,
+                context_bounds=self.incremental.context_bounds(document),
+            )
             
             # Create response message with results
             response_parts: list[Part] = [
                 TextPart(text=f"Found {len(citations)} citation(s)"),
-                DataPart(data={"citations": citations_data})
+                DataPart(data=citations_data)
             ]
             
             yield (
@@ -88,6 +108,18 @@ class ParserAgentExecutor:
                 None
             )
 
+    def _parse(self, text: str, message: Message) -> ParsedDocument:
+        """Parse text, incrementally if this context was parsed before."""
+        context_id = getattr(message, "context_id", None)
+        if not context_id:
+            return self.incremental.parse(text)
+
+        document = self.incremental.parse(text, self.documents.pop(context_id, None))
+        self.documents[context_id] = document
+        while len(self.documents) > self.MAX_DOCUMENTS:
+            self.documents.popitem(last=False)
+        return document
+
     def _extract_text(self, message: Message) -> str:
         """Extract text content from an A2A message."""
         text_parts = []
@@ -4,6 +4,7 @@ Parser Agent - AgentCard Definition
 Defines the identity, capabilities, and skills for the Citation Parser Agent.
 """
 from a2a.types import AgentCard, AgentSkill
+from agents.common.wire import supported_formats
 
 
 def get_parser_agent_card() -> AgentCard:
@@ -22,7 +23,9 @@ def get_parser_agent_card() -> AgentCard:
                 examples=[
                     "Parse this research paper for citations",
                     "Extract all DOIs from this text"
-                ]
+                ],
+                # Citation wire formats; request one via message metadata "accept"
+                outputModes=["text"] + [f.media_type for f in supported_formats()]
             )
         ],
         defaultInputModes=["text"],
@@ -0,0 +1,395 @@
+"""
+Citation Parser Agent - Incremental Re-parse
+
+Re-parses an edited document by diffing it against the previous version
+and re-scanning only the changed region plus a safety margin. Citations
+outside that region are carried over with their IDs and any verification
+results recorded against them.
+"""
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+from agents.common.models import Citation, CitationType
+from agents.parser.agent import CONTEXT_WINDOW, CitationSpan, ParserAgent
+
+
+@dataclass
+class ParsedDocument:
+    """A parsed document together with the spans needed to re-parse it."""
+    text: str
+    spans: Dict[CitationType, List[CitationSpan]]
+    citations: List[Citation]
+    results: dict = field(default_factory=dict)  # citation_id -> verification/analysis result
+    scanned_chars: int = 0  # Characters re-scanned to produce this document
+    # Indexes that let a re-parse settle duplicates without visiting every span
+    winners: Dict[CitationType, List[CitationSpan]] = field(default_factory=dict)  # Spans with a citation
+    owners: Dict[str, CitationSpan] = field(default_factory=dict)  # Dedup key -> winning span
+    key_counts: Dict[str, int] = field(default_factory=dict)  # Dedup key -> number of spans
+
+
+_start = attrgetter("start")
+_end = attrgetter("end")
+
+
+class IncrementalParser:
+    """
+    Parses documents incrementally against their previous version.
+
+    The edit is located as a single changed region (common prefix and
+    suffix), widened by `margin` characters on each side and towards whole
+    lines. Any old span crossing the window is pulled into it. Each
+    pattern is then re-run from the window start until its matches line
+    up with the old ones again, or until no further match is possible.
+    Only the re-scanned spans are resolved; citations outside the window
+    keep their IDs, and re-scanned ones that still match an old span
+    keep its ID too, so verification results carry over.
+    """
+
+    DEFAULT_MARGIN = 256
+
+    # Fall back to a full parse once the window covers this much of the document
+    FULL_PARSE_RATIO = 0.5
+
+    # Chunk size for prefix/suffix comparison
+    _CHUNK = 4096
+
+    def __init__(self, agent: Optional[ParserAgent] = None, margin: int = DEFAULT_MARGIN):
+        # Reused citations keep their context only if the edit cannot reach it
+        if margin <= CONTEXT_WINDOW:
+            raise ValueError(f"margin must exceed the {CONTEXT_WINDOW}-character context window, got {margin}")
+        self.agent = agent or ParserAgent()
+        self.margin = margin
+
+    def parse(self, text: str, previous: Optional[ParsedDocument] = None) -> ParsedDocument:
+        """
+        Parse text, reusing work from a previous version when given.
+
+        Args:
+            text: The (possibly edited) document text.
+            previous: The ParsedDocument for the prior version, if any.
+
+        Returns:
+            A ParsedDocument for text.
+        """
+        if previous is None:
+            return self._full_parse(text)
+        if previous.text == text:
+            return previous
+
+        old_text = previous.text
+        prefix = self._common_prefix(old_text, text)
+        suffix = self._common_suffix(old_text, text, len(old_text) - prefix, len(text) - prefix)
+        delta = len(text) - len(old_text)
+
+        start, old_end = self._window(old_text, previous.spans, prefix, len(old_text) - suffix)
+        new_end = old_end + delta
+        if new_end - start > self.FULL_PARSE_RATIO * len(text):
+            return self._full_parse(text)
+
+        # kind -> (first, stop, fresh): old spans[first:stop] are replaced by fresh
+        edits: Dict[CitationType, Tuple[int, int, List[CitationSpan]]] = {}
+        scanned_to = new_end
+        for kind in self.agent.SCAN_ORDER:
+            first, stop, fresh, kind_end = self._rescan_kind(
+                text, kind, previous.spans.get(kind, []), start, old_end, delta
+            )
+            edits[kind] = (first, stop, fresh)
+            scanned_to = max(scanned_to, kind_end)
+
+        self._reuse_citations(text, previous, edits)
+        document = self._apply(text, previous, edits, start, delta)
+        if document is None:
+            document = self._resolve(text, self._splice(previous, edits, delta))
+            document.results = {
+                c.id: previous.results[c.id] for c in document.citations if c.id in previous.results
+            }
+        document.scanned_chars = scanned_to - start
+        return document
+
+    def context_bounds(self, document: ParsedDocument) -> Dict[str, Tuple[int, int]]:
+        """Map citation IDs to the offsets of their context in the document text."""
+        return {
+            span.citation.id: self.agent.context_bounds(document.text, span.start, span.end)
+            for spans in document.spans.values()
+            for span in spans
+            if span.citation is not None
+        }
+
+    def _full_parse(self, text: str) -> ParsedDocument:
+        """Parse text from scratch."""
+        spans = {kind: list(self.agent.scan(text, kind)) for kind in self.agent.SCAN_ORDER}
+        document = self._resolve(text, spans)
+        document.scanned_chars = len(text)
+        return document
+
+    def _resolve(self, text: str, spans: Dict[CitationType, List[CitationSpan]]) -> ParsedDocument:
+        """Attach citations to all spans and drop stale ones from duplicate spans."""
+        resolved = self.agent.resolve(text, spans)
+        by_position = {(s.type, s.start): s for s in resolved}
+        key_counts: Dict[str, int] = Counter()
+        for kind, kind_spans in spans.items():
+            spans[kind] = [
+                by_position.get((s.type, s.start)) or (replace(s, citation=None) if s.citation else s)
+                for s in kind_spans
+            ]
+            key_counts.update(s.key for s in kind_spans if s.key is not None)
+        winners: Dict[CitationType, List[CitationSpan]] = {kind: [] for kind in spans}
+        for span in resolved:
+            winners[span.type].append(span)
+        return ParsedDocument(
+            text=text,
+            spans=spans,
+            citations=[s.citation for s in resolved],
+            winners=winners,
+            owners={s.key: s for s in resolved},
+            key_counts=dict(key_counts),
+        )
+
+    def _reuse_citations(
+        self,
+        text: str,
+        previous: ParsedDocument,
+        edits: Dict[CitationType, Tuple[int, int, List[CitationSpan]]],
+    ) -> None:
+        """Give re-scanned spans the citation (and ID) of an identical replaced span."""
+        replaced: Dict[Tuple[CitationType, Optional[str], str], List[Citation]] = {}
+        for kind, (first, stop, _) in edits.items():
+            for span in previous.spans.get(kind, [])[first:stop]:
+                if span.citation is not None:
+                    replaced.setdefault((kind, span.key, span.raw_text), []).append(span.citation)
+
+        for kind, (_, _, fresh) in edits.items():
+            for span in fresh:
+                citations = replaced.get((kind, span.key, span.raw_text))
+                if citations:
+                    ctx_start, ctx_end = self.agent.context_bounds(text, span.start, span.end)
+                    span.citation = citations.pop(0).model_copy(
+                        update={"context": text[ctx_start:ctx_end]}
+                    )
+
+    def _apply(
+        self,
+        text: str,
+        previous: ParsedDocument,
+        edits: Dict[CitationType, Tuple[int, int, List[CitationSpan]]],
+        start: int,
+        delta: int,
+    ) -> Optional[ParsedDocument]:
+        """
+        Build the new document touching only the re-scanned spans.
+
+        Returns None when the edit changes which occurrence of a duplicated
+        key wins outside the window; the caller then resolves everything.
+        """
+        order = {kind: i for i, kind in enumerate(self.agent.SCAN_ORDER)}
+        key_counts = dict(previous.key_counts)
+        replaced_owners: Dict[str, CitationSpan] = {}
+        first_added: Dict[str, CitationSpan] = {}
+        added_counts: Dict[str, int] = Counter()
+        for kind in self.agent.SCAN_ORDER:
+            first, stop, fresh = edits[kind]
+            for span in previous.spans.get(kind, [])[first:stop]:
+                if span.key is not None:
+                    key_counts[span.key] -= 1
+                    if not key_counts[span.key]:
+                        del key_counts[span.key]
+                    if span.citation is not None:
+                        replaced_owners[span.key] = span
+            for span in fresh:
+                if span.key is not None:
+                    key_counts[span.key] = key_counts.get(span.key, 0) + 1
+                    added_counts[span.key] += 1
+                    first_added.setdefault(span.key, span)
+
+        # Settle the winner of every key the edit touched
+        owners = dict(previous.owners)
+        for key in replaced_owners.keys() | first_added.keys():
+            candidate = first_added.get(key)
+            if key not in replaced_owners and key in owners:
+                owner = owners[key]
+                if candidate is None or order[owner.type] < order[candidate.type] or \
+                        (owner.type == candidate.type and owner.start < start):
+                    continue
+                return None  # A new earlier duplicate outranks a citation outside the window
+            if key_counts.get(key, 0) > added_counts[key]:
+                # Other occurrences outside the window all ranked below the replaced owner
+                if candidate is None or order[candidate.type] > order[replaced_owners[key].type]:
+                    return None
+            if candidate is None:
+                del owners[key]
+            else:
+                owners[key] = candidate
+
+        spans: Dict[CitationType, List[CitationSpan]] = {}
+        winners: Dict[CitationType, List[CitationSpan]] = {}
+        citations: List[Citation] = []
+        offset = 0
+        for kind in self.agent.SCAN_ORDER:
+            first, stop, fresh = edits[kind]
+            old_spans = previous.spans.get(kind, [])
+            old_winners = previous.winners.get(kind, [])
+            head = bisect_left(old_winners, start, key=_start)
+            tail = len(old_winners)
+            if stop < len(old_spans):
+                tail = bisect_left(old_winners, old_spans[stop].start, key=_start)
+
+            for span in fresh:
+                if span.citation is not None and owners.get(span.key) is not span:
+                    span.citation = None  # Outranked by another occurrence
+            window = self.agent.resolve(text, {kind: [s for s in fresh if owners.get(s.key) is s]})
+            built = {s.start: s for s in window}
+            fresh = [built.get(s.start, s) for s in fresh]
+            for span in window:
+                owners[span.key] = span
+
+            kept = old_spans[stop:]
+            kept_winners = old_winners[tail:]
+            if delta:
+                kept = [s.shifted(delta) for s in kept]
+                kept_winners = [s for s in kept if s.citation is not None]
+                for span in kept_winners:
+                    owners[span.key] = span
+
+            spans[kind] = old_spans[:first] + fresh + kept
+            winners[kind] = old_winners[:head] + window + kept_winners
+            citations += previous.citations[offset:offset + head]
+            citations += [s.citation for s in window]
+            citations += previous.citations[offset + tail:offset + len(old_winners)]
+            offset += len(old_winners)
+
+        results = dict(previous.results)
+        current = {owners[key].citation.id for key in replaced_owners if key in owners}
+        for span in replaced_owners.values():
+            if span.citation.id not in current:
+                results.pop(span.citation.id, None)
+
+        return ParsedDocument(
+            text=text,
+            spans=spans,
+            citations=citations,
+            results=results,
+            winners=winners,
+            owners=owners,
+            key_counts=key_counts,
+        )
+
+    def _splice(
+        self,
+        previous: ParsedDocument,
+        edits: Dict[CitationType, Tuple[int, int, List[CitationSpan]]],
+        delta: int,
+    ) -> Dict[CitationType, List[CitationSpan]]:
+        """Replace the re-scanned spans and shift the ones after them."""
+        spans = {}
+        for kind, (first, stop, fresh) in edits.items():
+            old_spans = previous.spans.get(kind, [])
+            spans[kind] = old_spans[:first] + fresh + [s.shifted(delta) for s in old_spans[stop:]]
+        return spans
+
+    def _window(
+        self,
+        text: str,
+        spans: Dict[CitationType, List[CitationSpan]],
+        edit_start: int,
+        edit_end: int,
+    ) -> Tuple[int, int]:
+        """
+        Return the re-scan window in old-text coordinates.
+
+        The window is the edit plus the margin, widened to line boundaries
+        and until no old span of any type straddles either edge.
+        """
+        start = max(0, edit_start - self.margin)
+        end = min(len(text), edit_end + self.margin)
+        # Prefer whole lines, but never widen by more than another margin
+        start = max(text.rfind("\n", 0, start) + 1, start - self.margin)
+        newline = text.find("\n", end, end + self.margin)
+        end = min(len(text), end + self.margin) if newline == -1 else newline
+
+        changed = True
+        while changed:
+            changed = False
+            for kind_spans in spans.values():
+                i = bisect_right(kind_spans, start, key=_end)
+                if i < len(kind_spans) and kind_spans[i].start < start:
+                    start, changed = kind_spans[i].start, True
+                j = bisect_left(kind_spans, end, key=_start) - 1
+                if j >= 0 and kind_spans[j].end > end:
+                    end, changed = kind_spans[j].end, True
+        return start, end
+
+    def _rescan_kind(
+        self,
+        text: str,
+        kind: CitationType,
+        old_spans: List[CitationSpan],
+        start: int,
+        old_end: int,
+        delta: int,
+    ) -> Tuple[int, int, List[CitationSpan], int]:
+        """
+        Re-scan one citation type from the window start.
+
+        Scanning continues past the window until a match coincides with a
+        shifted old span; from there on the old matches are reused as-is.
+        The old scan found nothing after its last span, and the text there
+        is unchanged, so once the scan is past every old span only start
+        positions before that point are tried.
+
+        Returns (first, stop, fresh, scanned_to): old_spans[first:stop] are
+        replaced by fresh, and scanning stopped at scanned_to.
+        """
+        first = bisect_right(old_spans, start, key=_end)
+        tail = bisect_left(old_spans, old_end, key=_start)
+        new_end = old_end + delta
+
+        fresh: List[CitationSpan] = []
+        pos = start
+        limit = new_end
+        if tail < len(old_spans):
+            last = old_spans[-1]
+            limit = last.end + delta
+            t = tail
+            # While an old span lies ahead, the next match is at most that far away
+            for span in self.agent.scan(text, kind, start):
+                if span.start >= new_end:
+                    while t < len(old_spans) and old_spans[t].start + delta < span.start:
+                        t += 1
+                    if t < len(old_spans):
+                        old = old_spans[t]
+                        if (old.start + delta, old.end + delta, old.key) == (span.start, span.end, span.key):
+                            return first, t, fresh, span.end
+                fresh.append(span)
+                pos = span.end
+                if pos > last.start + delta:
+                    break
+
+        for span in self.agent.scan(text, kind, pos, limit):
+            fresh.append(span)
+            pos = span.end
+        return first, len(old_spans), fresh, max(pos, limit)
+
+    def _common_prefix(self, a: str, b: str) -> int:
+        """Length of the common prefix of a and b."""
+        limit = min(len(a), len(b))
+        i = 0
+        while i < limit and a[i:i + self._CHUNK] == b[i:i + self._CHUNK]:
+            i += self._CHUNK
+        i = min(i, limit)
+        while i < limit and a[i] == b[i]:
+            i += 1
+        return i
+
+    def _common_suffix(self, a: str, b: str, max_a: int, max_b: int) -> int:
+        """Length of the common suffix of a and b, not exceeding max_a/max_b."""
+        limit = min(max_a, max_b)
+        la, lb = len(a), len(b)
+        n = 0
+        while n + self._CHUNK <= limit and \
+                a[la - n - self._CHUNK:la - n] == b[lb - n - self._CHUNK:lb - n]:
+            n += self._CHUNK
+        while n < limit and a[la - n - 1] == b[lb - n - 1]:
+            n += 1
+        return n
@@ -2,10 +2,21 @@
 Parser Agent - Server Entry Point
 
 Starts the A2A server with SLIM transport binding for the Parser Agent.
+
+With PARSER_WORKERS > 1 the server pre-forks: the parent warms up the
+parser, binds the socket and forks workers that share it. SIGTERM/SIGINT
+drain every worker (stop accepting, finish in-flight requests for up to
+PARSER_DRAIN_SECONDS) before exiting. Each worker keeps its own cache of
+documents for incremental re-parsing, so resubmissions only reuse it when
+they land on the same worker.
 """
 import asyncio
 import os
+import signal
+import socket
 import sys
+import time
+import traceback
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -14,9 +25,28 @@ from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from agents.parser.card import get_parser_agent_card
+from agents.parser.agent import ParserAgent
 from agents.parser.agent_executor import ParserAgentExecutor
 
 
+# Exercises every citation pattern once during warm-up
+WARM_UP_TEXT = """
+See doi:10.1234/warmup.2024 and https://example.org/warmup.
+Background: ISBN 978-0-13-468599-1.
+Smith, J. A. (2020). Warming up the parser. Journal of Startup.
+"""
+
+STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+# A worker exiting sooner than this after it was started counts as a failed start
+MIN_WORKER_UPTIME = 5.0
+# Give up once this many workers in a row have failed to start
+MAX_FAILED_STARTS = 5
+# Backoff before replacing a worker that failed to start (doubles each time)
+RESPAWN_DELAY = 0.5
+MAX_RESPAWN_DELAY = 30.0
+
+
 def create_parser_server():
     """Create and configure the Parser Agent A2A server."""
     
@@ -37,17 +67,133 @@ def create_parser_server():
     return app
 
 
+def warm_up():
+    """
+    Pay one-off startup costs before accepting traffic.
+    
+    Imports the server stack and runs a parse end to end, so regexes,
+    pydantic validators and lazy imports are ready before the first
+    request (and, when pre-forking, shared copy-on-write by workers).
+    """
+    import uvicorn  # noqa: F401
+    
+    citations = ParserAgent().parse(WARM_UP_TEXT)
+    [c.model_dump() for c in citations]
+
+
+def serve_prefork(app, host: str, port: int, workers: int, drain_seconds: float):
+    """
+    Serve app from `workers` forked processes sharing one listening socket.
+    
+    Workers that die are replaced, with an exponential backoff while they
+    keep exiting right after starting; after MAX_FAILED_STARTS such exits
+    in a row the server gives up. SIGTERM/SIGINT are forwarded to every
+    worker, each of which stops accepting and drains in-flight requests.
+    """
+    import uvicorn
+    
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    
+    children: dict[int, float] = {}  # pid -> start time
+    stopping = False
+    failed_starts = 0
+    
+    def spawn():
+        # Hold back stop signals until the child is recorded, so none can
+        # slip in between fork() and children[pid] and miss the new worker
+        signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    # Worker: uvicorn installs its own handlers for graceful shutdown
+                    for signum in STOP_SIGNALS:
+                        signal.signal(signum, signal.SIG_DFL)
+                    signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+                    config = uvicorn.Config(app, timeout_graceful_shutdown=drain_seconds)
+                    server = uvicorn.Server(config)
+                    server.run(sockets=[sock])
+                    status = 0 if server.started else 1
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    os._exit(status)
+            children[pid] = time.monotonic()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    for signum in STOP_SIGNALS:
+        signal.signal(signum, stop)
+    
+    for _ in range(workers):
+        spawn()
+    print(f"Parser Agent serving with {workers} workers (pid {os.getpid()})")
+    
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        started_at = children.pop(pid, None)
+        if stopping or started_at is None:
+            continue
+        
+        if time.monotonic() - started_at < MIN_WORKER_UPTIME:
+            failed_starts += 1
+        else:
+            failed_starts = 0
+        if failed_starts >= MAX_FAILED_STARTS:
+            print(f"Workers exited {failed_starts} times in a row right after starting, giving up")
+            stop(None, None)
+            continue
+        
+        if failed_starts:
+            delay = min(MAX_RESPAWN_DELAY, RESPAWN_DELAY * 2 ** (failed_starts - 1))
+            print(f"Worker {pid} exited shortly after starting, replacing it in {delay:.1f}s")
+            time.sleep(delay)
+        else:
+            print(f"Worker {pid} exited, starting a replacement")
+        if not stopping:
+            spawn()
+    
+    sock.close()
+    print("Parser Agent stopped")
+    if failed_starts >= MAX_FAILED_STARTS:
+        sys.exit(1)
+
+
 def main():
     """Run the Parser Agent server."""
     import uvicorn
     
     host = os.getenv("PARSER_HOST", "0.0.0.0")
     port = int(os.getenv("PARSER_PORT", "8001"))
+    workers = int(os.getenv("PARSER_WORKERS", "1"))
+    drain_seconds = float(os.getenv("PARSER_DRAIN_SECONDS", "30"))
     
     print(f"Starting Parser Agent on {host}:{port}")
     
-    app = create_parser_server()
-    uvicorn.run(app.build(), host=host, port=port)
+    warm_up()
+    app = create_parser_server().build()
+    
+    if workers > 1:
+        serve_prefork(app, host, port, workers, drain_seconds)
+    else:
+        uvicorn.run(app, host=host, port=port, timeout_graceful_shutdown=drain_seconds)
 
 
 if __name__ == "__main__":
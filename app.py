@@ -4,12 +4,31 @@ Citation Verifier - Flask Web Frontend
 Serves the web UI and acts as an A2A client to the Supervisor agent.
 For Phase 1, this is a skeleton that will be connected to agents later.
 """
+import json
 import os
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
 from config import Config
+from agents.common.report import ReportAggregator
 
 app = Flask(__name__)
 
+# Seconds between keep-alive comments on idle event streams
+SSE_HEARTBEAT = 15.0
+
+# Finished reports stay viewable this long
+REPORT_TTL_SECONDS = 3600.0
+
+# Reports kept at most; the oldest are dropped first
+MAX_REPORTS = 256
+
+# In-flight and finished reports, keyed by task ID, oldest first
+reports: "OrderedDict[str, ReportAggregator]" = OrderedDict()
+reports_lock = threading.Lock()
+
 
 @app.route("/")
 def index():
@@ -30,12 +49,27 @@ def verify():
     if not text.strip():
         return jsonify({"error": "No text provided"}), 400
     
+    # Register the task so results can be streamed as they arrive
+    task_id = uuid.uuid4().hex[:12]
+    aggregator = ReportAggregator(
+        analysis_mode="llm" if request.form.get("use_llm") else "tfidf"
+    )
+    with reports_lock:
+        _evict_reports()
+        reports[task_id] = aggregator
+    
     # TODO: Phase 3 - Send to Supervisor Agent via A2A
+    # Browsers submitting the form go to the live progress page
+    if request.accept_mimetypes.best_match(["application/json", "text/html"]) == "text/html":
+        return redirect(url_for("processing", task_id=task_id))
+    
     # For now, return a stub response
     return jsonify({
         "status": "received",
         "message": "Citation verification coming soon!",
-        "text_length": len(text)
+        "text_length": len(text),
+        "task_id": task_id,
+        "events_url": url_for("events", task_id=task_id),
     })
 
 
@@ -44,9 +78,18 @@ def status(task_id: str):
     """
     Check verification task status.
     
-    Phase 1: Returns stub.
-    Later: Queries Supervisor Agent for task state.
+    Returns running counters for known tasks, a stub otherwise.
+    Prefer /events/<task_id>, which pushes the same data as it changes.
     """
+    aggregator = reports.get(task_id)
+    if aggregator is not None:
+        progress = aggregator.progress()
+        return jsonify({
+            "task_id": task_id,
+            "status": "completed" if progress["complete"] else "pending",
+            **progress
+        })
+    
     return jsonify({
         "task_id": task_id,
         "status": "pending",
@@ -59,9 +102,16 @@ def report(task_id: str):
     """
     Display verification report.
     
-    Phase 1: Returns stub template.
-    Later: Renders actual hallucination report.
+    Renders the report for known tasks, including partial reports for
+    tasks still running (the page then subscribes to /events/<task_id>).
+    Unknown tasks get stub data for template development.
     """
+    aggregator = reports.get(task_id)
+    if aggregator is not None:
+        report_data = aggregator.snapshot().model_dump(mode="json")
+        report_data["complete"] = aggregator.complete
+        return render_template("report.html", report=report_data, task_id=task_id)
+    
     # Stub data for template development
     stub_report = {
         "overall_score": 75.0,
@@ -69,9 +119,80 @@ def report(task_id: str):
         "verified_count": 2,
         "flagged_count": 1,
         "analysis_mode": "tfidf",
-        "citations": []
+        "citations": [],
+        "results": {},
+        "complete": True
     }
-    return render_template("report.html", report=stub_report)
+    return render_template("report.html", report=stub_report, task_id=task_id)
+
+
+@app.route("/processing/<task_id>")
+def processing(task_id: str):
+    """Display the progress page for a running verification task."""
+    return render_template("processing.html")
+
+
+@app.route("/events/<task_id>")
+def events(task_id: str):
+    """
+    Stream report updates as Server-Sent Events.
+    
+    Sends a `result` event per AnalysisResult (with the running counters)
+    and a final `complete` event. Event IDs index the result log, so a
+    reconnecting EventSource resumes from its Last-Event-ID.
+    """
+    aggregator = reports.get(task_id)
+    if aggregator is None:
+        return jsonify({"error": "Unknown task"}), 404
+    
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    since = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+    
+    def stream(since: int):
+        while True:
+            results, complete = aggregator.wait(since, timeout=SSE_HEARTBEAT)
+            for result in results:
+                citation = aggregator.citations_by_id.get(result.citation_id)
+                yield _sse_event("result", {
+                    "result": result.model_dump(mode="json"),
+                    "citation": citation.model_dump(mode="json") if citation else None,
+                    **aggregator.progress()
+                }, event_id=since)
+                since += 1
+            if complete:
+                yield _sse_event("complete", aggregator.progress())
+                return
+            if not results:
+                yield ": keep-alive\n\n"
+    
+    return Response(
+        stream(since),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _evict_reports() -> None:
+    """Drop finished reports past their TTL, then the oldest beyond MAX_REPORTS."""
+    now = time.monotonic()
+    expired = [
+        task_id for task_id, aggregator in reports.items()
+        if aggregator.closed_at is not None and now - aggregator.closed_at > REPORT_TTL_SECONDS
+    ]
+    for task_id in expired:
+        del reports[task_id]
+    while len(reports) >= MAX_REPORTS:
+        _, aggregator = reports.popitem(last=False)
+        aggregator.close()  # Ends any event stream still attached
+
+
+def _sse_event(event: str, data: dict, event_id: int | None = None) -> str:
+    """Format one Server-Sent Event."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
 
 
 @app.route("/health")
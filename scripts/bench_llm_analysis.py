@@ -0,0 +1,100 @@
+"""
+Benchmark: LLM calls per report and wall time for the analyst
+
+Runs the LLM analyzer through litellm against the local mock completion
+server (scripts/mock_llm_server.py) with injected latency, and compares:
+  - per-citation: one request per claim/source pair
+  - batched: pairs packed under the token budget
+  - batched, warm cache: the same report analysed again
+  - batched, tight timeout: requests slower than the timeout fall back to TF-IDF
+
+Usage: python scripts/bench_llm_analysis.py [--citations 200] [--latency 0.5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# litellm needs a key for OpenAI-compatible endpoints and should not fetch its cost map
+os.environ.setdefault("OPENAI_API_KEY", "mock")
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from agents.analyst.agent import AnalysisRequest, AnalyzerStats, LLMAnalyzer
+from mock_llm_server import start_mock_server
+
+WORDS = ("neural network training data model accuracy protein folding climate "
+         "temperature ocean policy economic growth survey participants vaccine "
+         "efficacy trial genome sequence quantum error correction").split()
+
+
+def build_report(count: int, seed: int):
+    """Claim/source pairs with realistic-length source snippets."""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(count):
+        claim = " ".join(rng.choices(WORDS, k=12))
+        source = " ".join(rng.choices(WORDS, k=150))
+        requests.append(AnalysisRequest(citation_id=f"c{i}", claim=claim, source=source))
+    return requests
+
+
+async def run(analyzer: LLMAnalyzer, requests, server) -> dict:
+    before = server.request_count
+    analyzer.stats = AnalyzerStats()
+    start = time.perf_counter()
+    results = await analyzer.analyze(requests)
+    return {
+        "wall": time.perf_counter() - start,
+        "calls": server.request_count - before,
+        "llm": sum(1 for r in results if r.analysis_mode == "llm"),
+        "cache_hits": analyzer.stats.cache_hits,
+        "fallbacks": analyzer.stats.fallbacks,
+    }
+
+
+async def main(args):
+    server = start_mock_server(latency=args.latency, per_item_latency=args.per_item)
+    requests = build_report(args.citations, args.seed)
+    model = "openai/mock"
+
+    per_citation = LLMAnalyzer(model, api_base=server.api_base, token_budget=1,
+                               max_concurrency=args.concurrency)
+    batched = LLMAnalyzer(model, api_base=server.api_base, token_budget=args.token_budget,
+                          max_concurrency=args.concurrency)
+    impatient = LLMAnalyzer(model, api_base=server.api_base, token_budget=args.token_budget,
+                            max_concurrency=args.concurrency, request_timeout=args.latency / 2)
+
+    rows = [
+        ("per-citation", await run(per_citation, requests, server)),
+        ("batched", await run(batched, requests, server)),
+        ("batched, warm cache", await run(batched, requests, server)),
+        ("batched, tight timeout", await run(impatient, requests, server)),
+    ]
+
+    print("=" * 70)
+    print("LLM analysis - calls per report and wall time (mock server)")
+    print("=" * 70)
+    print(f"Citations: {args.citations}  Latency: {args.latency}s + {args.per_item}s/item  "
+          f"Concurrency: {args.concurrency}  Token budget: {args.token_budget}")
+    print("-" * 70)
+    print(f"{'mode':<22} {'calls':>6} {'wall s':>8} {'llm':>6} {'cached':>7} {'tfidf':>6}")
+    for name, row in rows:
+        print(f"{name:<22} {row['calls']:>6} {row['wall']:>8.2f} {row['llm']:>6} "
+              f"{row['cache_hits']:>7} {row['fallbacks']:>6}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--citations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--per-item", type=float, default=0.02)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--token-budget", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,103 @@
+"""
+Benchmark: time-to-first-result for progressive reports
+
+Simulates a slow verifier (random per-citation latency plus a few very
+slow lookups) and compares when the user first sees a result:
+  - batch: the report is only shown once every lookup has finished
+  - stream: results are pushed over /events/<task_id> as they arrive
+
+Runs entirely in-process against the Flask app; no agents needed.
+
+Usage: python scripts/bench_report_stream.py [--citations 200] [--concurrency 16]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.common.models import AnalysisResult, Citation, CitationType
+from app import app, reports
+
+
+def simulated_verifier(citation: Citation, rng: random.Random, slow_seconds: float) -> AnalysisResult:
+    """Pretend to verify a citation, sleeping for a simulated lookup latency."""
+    latency = slow_seconds if rng.random() < 0.02 else rng.uniform(0.05, 0.4)
+    time.sleep(latency)
+    verdict = rng.choice(["supported", "supported", "contradicted", "insufficient_source"])
+    return AnalysisResult(
+        citation_id=citation.id,
+        verdict=verdict,
+        confidence_score=rng.uniform(0, 100),
+        analysis_mode="tfidf",
+    )
+
+
+def run(count: int, concurrency: int, slow_seconds: float, seed: int) -> dict:
+    """Run one simulated verification and return timings in seconds."""
+    rng = random.Random(seed)
+    client = app.test_client()
+    task_id = client.post("/verify", data={"text": "benchmark"}).get_json()["task_id"]
+    aggregator = reports[task_id]
+    citations = [
+        Citation(id=f"c{i}", type=CitationType.DOI, raw_text=f"doi:10.1234/{i}")
+        for i in range(count)
+    ]
+    aggregator.set_citations(citations)
+
+    timings = {}
+    start = time.perf_counter()
+
+    def consume():
+        response = client.get(f"/events/{task_id}")
+        for chunk in response.response:
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith("event: result") and "first_event" not in timings:
+                timings["first_event"] = time.perf_counter() - start
+            if chunk.startswith("event: complete"):
+                timings["complete_event"] = time.perf_counter() - start
+                break
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(simulated_verifier, c, random.Random(rng.random()), slow_seconds)
+                   for c in citations]
+        for future in as_completed(futures):
+            aggregator.add(future.result())
+    aggregator.close()
+    # A batch report can only be rendered once every lookup is done
+    timings["batch_report"] = time.perf_counter() - start
+
+    consumer.join()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--citations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--slow-seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    timings = run(args.citations, args.concurrency, args.slow_seconds, args.seed)
+
+    print("=" * 50)
+    print("Progressive report - time to first result")
+    print("=" * 50)
+    print(f"Citations: {args.citations}  Concurrency: {args.concurrency}  "
+          f"Slow lookup: {args.slow_seconds}s")
+    print("-" * 50)
+    print(f"Batch report visible after:   {timings['batch_report']:.3f}s")
+    print(f"First streamed result after:  {timings['first_event']:.3f}s")
+    print(f"Streamed completion after:    {timings['complete_event']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
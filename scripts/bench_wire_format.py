@@ -0,0 +1,102 @@
+"""
+Benchmark: citation payload size and encode/decode time per wire format
+
+Parses a dense synthetic reference list with the incremental parser and
+encodes its citations in each wire format. Reports the size of the
+DataPart JSON the client receives and the time to encode and decode it.
+Formats whose optional dependency (msgpack, zstandard) is not installed
+are skipped.
+
+Usage: python scripts/bench_wire_format.py [--refs 2000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.common.wire import WireFormat, decode_citations, encode_citations
+from agents.parser.incremental import IncrementalParser
+
+
+FORMATS = [
+    "full",
+    "compact",
+    "columnar",
+    "columnar+gzip",
+    "columnar+msgpack",
+    "columnar+msgpack+zstd",
+]
+
+SURNAMES = "Smith Chen Garcia Müller Okafor Tanaka Ivanova Dubois Rossi Kowalski".split()
+
+
+def build_reference_list(count: int, seed: int) -> str:
+    """A bibliography where every line carries one or two identifiers."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        author = f"{rng.choice(SURNAMES)}, {chr(65 + rng.randrange(26))}."
+        year = rng.randint(1990, 2025)
+        kind = i % 3
+        if kind == 0:
+            ref = f"doi:10.{rng.randint(1000, 9999)}/j.{rng.randint(10000, 99999)}"
+        elif kind == 1:
+            ref = f"https://example.org/papers/{rng.randint(1, 10 ** 6)}"
+        else:
+            ref = f"arXiv:{rng.randint(1000, 2412):04d}.{rng.randint(10000, 99999)}"
+        lines.append(f"[{i + 1}] {author} ({year}). Results on topic {i}. {ref}")
+    return "\n".join(lines)
+
+
+def measure(citations, wire_format: WireFormat, text: str, bounds, repeat: int) -> dict:
+    encode, decode = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = encode_citations(citations, wire_format, text, bounds)
+        body = json.dumps(data)
+        encode.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        decoded = decode_citations(json.loads(body))
+        decode.append(time.perf_counter() - start)
+    assert len(decoded) == len(citations)
+    return {"bytes": len(body.encode("utf-8")), "encode": min(encode), "decode": min(decode)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--refs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    incremental = IncrementalParser()
+    text = build_reference_list(args.refs, args.seed)
+    document = incremental.parse(text)
+    bounds = incremental.context_bounds(document)
+
+    print("=" * 64)
+    print("Citation wire formats - payload size and codec time")
+    print("=" * 64)
+    print(f"References: {args.refs}  Citations: {len(document.citations)}  "
+          f"Text: {len(text) / 1024:.0f} KiB")
+    print("-" * 64)
+    print(f"{'format':<24} {'KiB':>9} {'ratio':>7} {'enc ms':>9} {'dec ms':>9}")
+    baseline = None
+    for token in FORMATS:
+        wire_format = WireFormat.parse(token)
+        if not wire_format.is_available():
+            print(f"{token:<24} {'(not installed)':>36}")
+            continue
+        row = measure(document.citations, wire_format, text, bounds, args.repeat)
+        baseline = baseline or row["bytes"]
+        print(f"{token:<24} {row['bytes'] / 1024:>9.1f} {row['bytes'] / baseline:>7.2f} "
+              f"{row['encode'] * 1000:>9.1f} {row['decode'] * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
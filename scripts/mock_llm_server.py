@@ -0,0 +1,126 @@
+"""
+Mock LLM Completion Server
+
+OpenAI-compatible /v1/chat/completions endpoint for testing and
+benchmarking the LLM analysis path without a real provider. Answers the
+analyst's batched prompt with one verdict per item (based on word overlap
+between claim and source) after an injected latency.
+
+Point the analyst at it with LLMAnalyzer("openai/mock", api_base=server.api_base)
+(any non-empty OPENAI_API_KEY works), where server comes from
+start_mock_server() or is http://localhost:8090/v1 when run standalone.
+
+Usage: python scripts/mock_llm_server.py [--port 8090] [--latency 0.5] [--per-item 0.02]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ITEM_PATTERN = re.compile(r"### Item (\d+)\nClaim: (.*?)\nSource: (.*?)(?=\n### Item |\Z)", re.DOTALL)
+
+
+def judge(claim: str, source: str) -> dict:
+    """Cheap stand-in for the model: word overlap between claim and source."""
+    claim_words = set(re.findall(r"[a-z]{4,}", claim.lower()))
+    source_words = set(re.findall(r"[a-z]{4,}", source.lower()))
+    if not source_words:
+        return {"verdict": "insufficient_source", "confidence": 10}
+    overlap = len(claim_words & source_words) / max(1, len(claim_words))
+    verdict = "supported" if overlap >= 0.5 else "unrelated"
+    return {"verdict": verdict, "confidence": round(overlap * 100)}
+
+
+class MockCompletionHandler(BaseHTTPRequestHandler):
+    """Handles chat completion requests for MockLLMServer."""
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        prompt = body["messages"][-1]["content"]
+        items = ITEM_PATTERN.findall(prompt)
+
+        server: "MockLLMServer" = self.server
+        with server.lock:
+            server.request_count += 1
+        time.sleep(server.latency + server.per_item_latency * len(items))
+
+        content = json.dumps([
+            {"id": int(index), **judge(claim, source), "explanation": "Mock verdict."}
+            for index, claim, source in items
+        ])
+        response = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        }
+        data = json.dumps(response).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (e.g. the analyst's request timeout)
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """Threaded mock completion server with injected latency."""
+    daemon_threads = True
+
+    def __init__(self, host: str, port: int, latency: float = 0.5, per_item_latency: float = 0.0):
+        super().__init__((host, port), MockCompletionHandler)
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def api_base(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.5,
+                      per_item_latency: float = 0.0) -> MockLLMServer:
+    """Start a mock server in a background thread (port 0 picks a free port)."""
+    server = MockLLMServer(host, port, latency, per_item_latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible completion server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per request")
+    parser.add_argument("--per-item", type=float, default=0.02, help="Extra seconds per batched item")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, args.latency, args.per_item)
+    print(f"Mock LLM server on {server.api_base} (latency {args.latency}s + {args.per_item}s/item)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,17 +1,30 @@
 """
 A2A Test Client for Parser Agent
 
-This script tests the Parser Agent by sending a message via A2A protocol.
+This script tests the Parser Agent by sending a message via A2A protocol,
+or load-tests it with concurrent requests.
 Run the Parser Agent first: python -m agents.parser.server
+(set PARSER_WORKERS=N for a multi-worker server)
 
-Usage: python scripts/test_parser_a2a.py
+Usage:
+    python scripts/test_parser_a2a.py
+    python scripts/test_parser_a2a.py --load --rps 200 --duration 30 \
+        --mix small=70,medium=25,large=5 [--no-reuse] [--accept columnar+msgpack+zstd]
 """
+import argparse
 import asyncio
+import bisect
+import random
+import time
+import uuid
 import httpx
 import json
 
 PARSER_URL = "http://localhost:8001"
 
+# Latency histogram bucket upper bounds, in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
 
 async def test_parser_agent():
     """Send a test message to the Parser Agent and print the response."""
@@ -28,23 +41,7 @@ async def test_parser_agent():
     Smith, J. A. (2020). The impact of AI on society. Journal of AI Research.
     """
     
-    # A2A message format - requires messageId
-    import uuid
-    
-    message = {
-        "jsonrpc": "2.0",
-        "method": "message/send",
-        "params": {
-            "message": {
-                "messageId": str(uuid.uuid4()),
-                "role": "user",
-                "parts": [
-                    {"type": "text", "text": test_text}
-                ]
-            }
-        },
-        "id": "test-1"
-    }
+    message = build_message(test_text, "test-1")
     
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -71,6 +68,170 @@ async def test_parser_agent():
         print(f"ERROR: {e}")
 
 
+def build_message(text: str, request_id: str, accept: list[str] | None = None) -> dict:
+    """
+    Build an A2A message/send request - requires messageId.
+    
+    accept lists citation wire formats in order of preference
+    (see agents/common/wire.py); the server falls back to full JSON.
+    """
+    message = {
+        "messageId": str(uuid.uuid4()),
+        "role": "user",
+        "parts": [
+            {"type": "text", "text": text}
+        ]
+    }
+    if accept:
+        message["metadata"] = {"accept": accept}
+    return {
+        "jsonrpc": "2.0",
+        "method": "message/send",
+        "params": {
+            "message": message
+        },
+        "id": request_id
+    }
+
+
+def build_payload(size: str, rng: random.Random) -> str:
+    """
+    Build a text payload of the given size class.
+    
+    small: a paragraph with a couple of citations
+    medium: a paper's reference list (~40 references)
+    large: a dissertation's reference list (~1,000 references)
+    """
+    count = {"small": 2, "medium": 40, "large": 1000}[size]
+    lines = ["According to recent work, the effect is significant."]
+    for i in range(count):
+        n = rng.randrange(100000)
+        kind = rng.randrange(4)
+        if kind == 0:
+            lines.append(f"See doi:10.{1000 + n % 9000}/study.{n} for details.")
+        elif kind == 1:
+            lines.append(f"Data is available at https://example.org/dataset/{n}.")
+        elif kind == 2:
+            lines.append(f"Background in ISBN 978-0-13-{n % 1000000:06d}-1.")
+        else:
+            lines.append(f"Author, J. A. ({1980 + n % 45}). Study number {n}. Journal of Tests.")
+    return "\n".join(lines)
+
+
+def parse_mix(mix: str) -> dict:
+    """Parse 'small=70,medium=25,large=5' into weights."""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_histogram(latencies_ms: list):
+    """Print a latency histogram with one row per bucket."""
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for latency in latencies_ms:
+        counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+    peak = max(counts) or 1
+    labels = [f"<= {b} ms" for b in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"  {label:>12} {count:>7}  {'#' * max(1, round(40 * count / peak))}")
+
+
+async def load_test(url: str, rps: float, duration: float, mix: dict,
+                    max_in_flight: int, reuse: bool, seed: int, accept: list[str] | None = None):
+    """
+    Send requests at a fixed rate (open loop) and report throughput and latency.
+    
+    Requests are started on schedule regardless of how fast responses come
+    back, up to max_in_flight; arrivals beyond that are counted as dropped.
+    With reuse, all requests share one connection pool; otherwise each
+    request opens a new connection.
+    """
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    # Pre-build payloads so generating text does not skew the send rate
+    payloads = {n: [build_payload(n, rng) for _ in range(8)] for n in names}
+    
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    shared = httpx.AsyncClient(timeout=60.0, limits=limits) if reuse else None
+    in_flight = asyncio.Semaphore(max_in_flight)
+    latencies: dict[str, list] = {n: [] for n in names}
+    errors = 0
+    dropped = 0
+    received_bytes = 0
+    
+    async def send_one(index: int, size: str):
+        nonlocal errors, received_bytes
+        message = build_message(rng.choice(payloads[size]), f"load-{index}", accept)
+        start = time.perf_counter()
+        try:
+            if shared is not None:
+                response = await shared.post(f"{url}/", json=message)
+            else:
+                async with httpx.AsyncClient(timeout=60.0) as client:
+                    response = await client.post(f"{url}/", json=message)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            # JSON-RPC errors come back as HTTP 200 with an "error" member
+            body = response.json() if response.status_code == 200 else {}
+            if "error" in body or "result" not in body:
+                errors += 1
+            else:
+                latencies[size].append(elapsed_ms)
+                received_bytes += len(response.content)
+        except (httpx.HTTPError, ValueError):
+            errors += 1
+        finally:
+            in_flight.release()
+    
+    tasks = []
+    total = int(rps * duration)
+    started = time.perf_counter()
+    for i in range(total):
+        delay = started + i / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if in_flight.locked():
+            dropped += 1
+            continue
+        await in_flight.acquire()
+        size = rng.choices(names, weights)[0]
+        tasks.append(asyncio.create_task(send_one(i, size)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    if shared is not None:
+        await shared.aclose()
+    
+    completed = sum(len(v) for v in latencies.values())
+    print(f"Target: {rps:.0f} req/s for {duration:.0f}s, max {max_in_flight} in flight, "
+          f"connection reuse {'on' if reuse else 'off'}")
+    print("-" * 50)
+    print(f"Completed: {completed}  Errors: {errors}  Dropped: {dropped}")
+    print(f"Throughput: {completed / elapsed:.1f} req/s")
+    if completed:
+        print(f"Mean response size: {received_bytes / completed / 1024:.1f} KiB")
+    print()
+    print(f"{'payload':<8} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for size in names:
+        values = latencies[size]
+        if values:
+            print(f"{size:<8} {len(values):>7} {percentile(values, 50):>9.1f} "
+                  f"{percentile(values, 90):>9.1f} {percentile(values, 99):>9.1f} {max(values):>9.1f}")
+    all_latencies = [v for values in latencies.values() for v in values]
+    if all_latencies:
+        print()
+        print("Latency histogram:")
+        print_histogram(all_latencies)
+
+
 async def test_health():
     """Check if the Parser Agent is running."""
     try:
@@ -90,11 +251,30 @@ async def test_health():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test or load-test the Parser Agent via A2A")
+    parser.add_argument("--url", default=PARSER_URL)
+    parser.add_argument("--load", action="store_true", help="Run a load test instead of one request")
+    parser.add_argument("--rps", type=float, default=50.0, help="Requests per second to send")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send for")
+    parser.add_argument("--mix", default="small=70,medium=25,large=5",
+                        help="Payload mix as size=weight pairs")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--no-reuse", action="store_true", help="Open a new connection per request")
+    parser.add_argument("--accept", action="append",
+                        help="Accepted citation wire format, most preferred first (repeatable)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    PARSER_URL = args.url
+    
     print("=" * 50)
-    print("Citation Verifier - Parser Agent Test")
+    print("Citation Verifier - Parser Agent " + ("Load Test" if args.load else "Test"))
     print("=" * 50)
     print()
     
-    asyncio.run(test_health())
-    print()
-    asyncio.run(test_parser_agent())
+    if asyncio.run(test_health()) and args.load:
+        print()
+        asyncio.run(load_test(args.url, args.rps, args.duration, parse_mix(args.mix),
+                              args.max_in_flight, not args.no_reuse, args.seed, args.accept))
+    elif not args.load:
+        print()
+        asyncio.run(test_parser_agent())
@@ -0,0 +1,184 @@
+"""
+Unit tests for the Analyst Agent logic.
+Run with: pytest tests/test_analyst.py -v
+"""
+import sys
+import os
+import asyncio
+import threading
+import json
+import re
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.analyst.agent import AnalysisRequest, LLMAnalyzer, TfidfAnalyzer
+
+
+class FakeCompletion:
+    """Answers every batched item as supported, optionally after a delay."""
+
+    def __init__(self, delay: float = 0.0, reply: str = None):
+        self.delay = delay
+        self.reply = reply
+        self.calls = []
+
+    async def __call__(self, model, messages):
+        self.calls.append(messages)
+        await asyncio.sleep(self.delay)
+        if self.reply is not None:
+            return self.reply
+        items = re.findall(r"### Item (\d+)", messages[-1]["content"])
+        return json.dumps([
+            {"id": int(i), "verdict": "supported", "confidence": 90, "explanation": "ok"}
+            for i in items
+        ])
+
+
+def _requests(count: int):
+    return [
+        AnalysisRequest(
+            citation_id=f"c{i}",
+            claim=f"Neural networks improve protein folding accuracy {i}",
+            source=f"We show neural networks improve protein folding accuracy {i}. " * 10,
+        )
+        for i in range(count)
+    ]
+
+
+def test_tfidf_analyzer():
+    """Test TF-IDF scoring of related and unrelated sources."""
+    analyzer = TfidfAnalyzer()
+    related = analyzer.analyze(_requests(1)[0])
+    unrelated = analyzer.analyze(AnalysisRequest("x", "Ocean temperature rises", "Quantum error correction codes"))
+    missing = analyzer.analyze(AnalysisRequest("y", "Anything", ""))
+
+    assert related.verdict == "supported"
+    assert unrelated.verdict == "unrelated"
+    assert missing.verdict == "insufficient_source"
+    assert related.analysis_mode == "tfidf"
+
+
+def test_tfidf_batch_matches_single_verdicts():
+    """Test that a batch is scored pair by pair, in order."""
+    requests = [
+        _requests(1)[0],
+        AnalysisRequest("x", "Ocean temperature rises", "Quantum error correction codes"),
+        AnalysisRequest("y", "Anything", ""),
+    ]
+
+    analyzer = TfidfAnalyzer()
+    results = analyzer.analyze_batch(requests)
+
+    assert [r.citation_id for r in results] == ["c0", "x", "y"]
+    assert [r.verdict for r in results] == ["supported", "unrelated", "insufficient_source"]
+    for request, result in zip(requests, results):
+        assert result == analyzer.analyze(request)
+
+
+def test_tfidf_batch_neighbours_do_not_change_scores():
+    """Test that a pair's score does not depend on the pairs batched with it."""
+    pair = AnalysisRequest("p", "Vaccines reduce measles cases", "Measles vaccination cut cases sharply in children")
+    others = [
+        AnalysisRequest(f"o{i}", "Measles vaccines are safe", f"Vaccine trial {i} reports measles outcomes")
+        for i in range(6)
+    ]
+    analyzer = TfidfAnalyzer()
+
+    assert analyzer.analyze_batch([pair, *others])[0] == analyzer.analyze(pair)
+
+
+class RecordingTfidf(TfidfAnalyzer):
+    def __init__(self):
+        self.calls = []
+
+    def analyze_batch(self, requests):
+        self.calls.append((threading.current_thread(), len(requests)))
+        return super().analyze_batch(requests)
+
+
+def test_fallback_runs_once_per_batch_off_the_event_loop():
+    """Test that TF-IDF fallbacks are scored per batch in a worker thread."""
+    fallback = RecordingTfidf()
+    analyzer = LLMAnalyzer("mock", complete=FakeCompletion(delay=1.0), fallback=fallback,
+                           request_timeout=0.05, max_items=5)
+
+    results = asyncio.run(analyzer.analyze(_requests(10)))
+
+    assert all(r.analysis_mode == "tfidf" for r in results)
+    assert [size for _, size in fallback.calls] == [5, 5]
+    assert all(thread is not threading.main_thread() for thread, _ in fallback.calls)
+
+
+def test_batches_pack_under_token_budget():
+    """Test that several pairs share one request within the token budget."""
+    complete = FakeCompletion()
+    analyzer = LLMAnalyzer("mock", complete=complete, token_budget=1500)
+
+    results = asyncio.run(analyzer.analyze(_requests(30)))
+
+    assert [r.citation_id for r in results] == [f"c{i}" for i in range(30)]
+    assert all(r.analysis_mode == "llm" for r in results)
+    assert 1 < len(complete.calls) < 30
+    for messages in complete.calls:
+        assert len(messages[-1]["content"]) // 4 <= 1500
+
+
+def test_cache_skips_repeat_requests():
+    """Test that re-analysing the same pairs makes no new calls."""
+    complete = FakeCompletion()
+    analyzer = LLMAnalyzer("mock", complete=complete)
+    asyncio.run(analyzer.analyze(_requests(10)))
+    calls = len(complete.calls)
+
+    requests = _requests(12)
+    requests[0].citation_id = "renamed"
+    results = asyncio.run(analyzer.analyze(requests))
+
+    assert analyzer.stats.cache_hits == 10
+    assert len(complete.calls) == calls + 1
+    assert results[0].citation_id == "renamed"
+
+
+def test_timeout_falls_back_to_tfidf():
+    """Test that a slow LLM request falls back to TF-IDF."""
+    analyzer = LLMAnalyzer("mock", complete=FakeCompletion(delay=1.0), request_timeout=0.05)
+
+    results = asyncio.run(analyzer.analyze(_requests(3)))
+
+    assert all(r.analysis_mode == "tfidf" for r in results)
+    assert analyzer.stats.fallbacks == 3
+
+
+def test_call_budget_falls_back_to_tfidf():
+    """Test that batches beyond the per-report call budget use TF-IDF."""
+    complete = FakeCompletion()
+    analyzer = LLMAnalyzer("mock", complete=complete, max_items=2, max_calls=2, max_concurrency=1)
+
+    results = asyncio.run(analyzer.analyze(_requests(6)))
+
+    assert len(complete.calls) == 2
+    assert [r.analysis_mode for r in results] == ["llm"] * 4 + ["tfidf"] * 2
+
+
+def test_malformed_reply_falls_back_per_item():
+    """Test that items missing from the reply are analysed with TF-IDF."""
+    reply = 'Here you go: [{"id": 0, "verdict": "contradicted", "confidence": 70}, {"id": 1, "verdict": "maybe"}]'
+    analyzer = LLMAnalyzer("mock", complete=FakeCompletion(reply=reply))
+
+    results = asyncio.run(analyzer.analyze(_requests(2)))
+
+    assert results[0].verdict == "contradicted"
+    assert results[0].analysis_mode == "llm"
+    assert results[1].analysis_mode == "tfidf"
+
+
+if __name__ == "__main__":
+    test_tfidf_analyzer()
+    test_tfidf_batch_matches_single_verdicts()
+    test_tfidf_batch_neighbours_do_not_change_scores()
+    test_fallback_runs_once_per_batch_off_the_event_loop()
+    test_batches_pack_under_token_budget()
+    test_cache_skips_repeat_requests()
+    test_timeout_falls_back_to_tfidf()
+    test_call_budget_falls_back_to_tfidf()
+    test_malformed_reply_falls_back_per_item()
+    print("All analyst tests passed!")
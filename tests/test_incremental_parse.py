@@ -0,0 +1,173 @@
+"""
+Unit tests for incremental re-parsing.
+Run with: pytest tests/test_incremental_parse.py -v
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.parser.agent import CONTEXT_WINDOW, ParserAgent
+from agents.parser.incremental import IncrementalParser
+
+
+def _reference_list(count: int) -> str:
+    """Build a reference list with one citation of every type per line."""
+    return "".join(
+        f"Author, J. A. ({1990 + i % 30}). Title of work {i}. Journal. "
+        f"doi:10.1234/x.{i} https://example.org/{i} ISBN 978-0-13-468599-1\n"
+        for i in range(count)
+    )
+
+
+def _apa_doi_list(count: int) -> str:
+    """Build a reference list with only an APA entry and a DOI per line."""
+    return "".join(
+        f"Author, J. A. ({1990 + i % 30}). Title of work {i}. Journal. doi:10.1234/x.{i}\n"
+        for i in range(count)
+    )
+
+
+def _fields(citations):
+    """Citation fields excluding the generated ID."""
+    return [c.model_dump(exclude={"id"}) for c in citations]
+
+
+def test_incremental_matches_full_parse():
+    """Test that an edited document parses the same as a fresh parse."""
+    parser = IncrementalParser()
+    text = _reference_list(200)
+    document = parser.parse(text)
+
+    edited = text.replace("Title of work 100.", "Title of work one hundred.")
+    edited = edited.replace("doi:10.1234/x.150", "doi:10.9999/fixed.150")
+    updated = parser.parse(edited, document)
+
+    assert _fields(updated.citations) == _fields(ParserAgent().parse(edited))
+
+
+def test_unchanged_citations_keep_ids_and_results():
+    """Test that citations outside the edit are reused with their results."""
+    parser = IncrementalParser()
+    text = _reference_list(200)
+    document = parser.parse(text)
+    document.results = {c.id: {"verdict": "supported"} for c in document.citations}
+
+    edited = text.replace("doi:10.1234/x.100 ", "doi:10.1234/y.100 ")
+    updated = parser.parse(edited, document)
+
+    old_ids = {c.id for c in document.citations}
+    reused = [c for c in updated.citations if c.id in old_ids]
+    changed = [c for c in updated.citations if c.doi == "10.1234/y.100"]
+
+    assert len(changed) == 1
+    assert changed[0].id not in old_ids
+    # Every other citation keeps its ID, including those re-scanned near the edit
+    assert len(reused) == len(updated.citations) - 1
+    assert set(updated.results) == {c.id for c in reused}
+
+
+def test_rescanned_citations_get_fresh_context():
+    """Test that reused citations near an edit pick up the edited context."""
+    parser = IncrementalParser()
+    text = _apa_doi_list(50)
+    document = parser.parse(text)
+
+    edited = text.replace("Title of work 25. Journal.", "Title of work 25. Journal. Reprinted.")
+    updated = parser.parse(edited, document)
+
+    old_ids = {c.id for c in document.citations}
+    doi = next(c for c in updated.citations if c.doi == "10.1234/x.25")
+    assert doi.id in old_ids
+    assert "Reprinted" in doi.context
+    assert _fields(updated.citations) == _fields(ParserAgent().parse(edited))
+
+
+def test_rescan_is_bounded_by_edit():
+    """Test that a small edit re-scans far less than the whole document."""
+    parser = IncrementalParser()
+    text = _reference_list(500)
+    document = parser.parse(text)
+
+    edited = text.replace("https://example.org/250", "https://example.org/two-fifty")
+    updated = parser.parse(edited, document)
+
+    assert updated.scanned_chars < len(edited) // 10
+    assert any(c.url == "https://example.org/two-fifty" for c in updated.citations)
+
+
+def test_rescan_is_bounded_when_types_are_missing():
+    """Test that citation types absent after the edit do not scan to the end."""
+    parser = IncrementalParser()
+    text = _apa_doi_list(200)
+    document = parser.parse(text)
+
+    for i in (5, 100, 195):
+        edited = text.replace(f"doi:10.1234/x.{i}\n", f"doi:10.1234/y.{i}\n")
+        updated = parser.parse(edited, document)
+
+        assert updated.scanned_chars < 4 * parser.margin
+        assert _fields(updated.citations) == _fields(ParserAgent().parse(edited))
+
+
+def test_rescan_does_not_grow_with_document():
+    """Test that the same edit re-scans as much of a large document as of a small one."""
+    parser = IncrementalParser()
+    scanned = []
+    for count in (200, 10000):
+        text = _apa_doi_list(count)
+        edited = text.replace(f"doi:10.1234/x.{count - 2}\n", f"doi:10.1234/y.{count - 2}\n")
+        updated = parser.parse(edited, parser.parse(text))
+        assert any(c.doi == f"10.1234/y.{count - 2}" for c in updated.citations)
+        scanned.append(updated.scanned_chars)
+
+    assert scanned[1] <= scanned[0] + 2 * len(str(10000))
+
+
+def test_margin_must_exceed_context_window():
+    """Test that a margin inside the context window is rejected."""
+    for margin in (0, 20, CONTEXT_WINDOW):
+        try:
+            IncrementalParser(margin=margin)
+        except ValueError:
+            continue
+        raise AssertionError(f"margin {margin} was accepted")
+    assert IncrementalParser(margin=CONTEXT_WINDOW + 1).margin == CONTEXT_WINDOW + 1
+
+
+def test_removed_duplicate_promotes_later_occurrence():
+    """Test that deleting the first of two duplicate DOIs keeps the second."""
+    parser = IncrementalParser(margin=120)
+    filler = "x" * 1000
+    text = f"See doi:10.1234/dup here.\n{filler}\nAgain doi:10.1234/dup there.\n"
+    document = parser.parse(text)
+
+    edited = text.replace("See doi:10.1234/dup here.", "See nothing here.")
+    updated = parser.parse(edited, document)
+
+    dois = [c for c in updated.citations if c.doi == "10.1234/dup"]
+    assert len(dois) == 1
+    assert "Again" in dois[0].context
+
+
+def test_large_edit_falls_back_to_full_parse():
+    """Test that rewriting most of the document triggers a full parse."""
+    parser = IncrementalParser()
+    document = parser.parse(_reference_list(20))
+
+    updated = parser.parse("Nothing to see. doi:10.5555/new", document)
+
+    assert updated.scanned_chars == len(updated.text)
+    assert [c.doi for c in updated.citations] == ["10.5555/new"]
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_parse()
+    test_unchanged_citations_keep_ids_and_results()
+    test_rescanned_citations_get_fresh_context()
+    test_rescan_is_bounded_by_edit()
+    test_rescan_is_bounded_when_types_are_missing()
+    test_rescan_does_not_grow_with_document()
+    test_margin_must_exceed_context_window()
+    test_removed_duplicate_promotes_later_occurrence()
+    test_large_edit_falls_back_to_full_parse()
+    print("All incremental parse tests passed!")
@@ -0,0 +1,113 @@
+"""
+Unit tests for progressive report aggregation.
+Run with: pytest tests/test_report.py -v
+"""
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.common.models import AnalysisResult, Citation, CitationType
+from agents.common.report import ReportAggregator
+
+
+def _citations(count: int):
+    return [
+        Citation(id=f"c{i}", type=CitationType.DOI, raw_text=f"doi:10.1234/{i}")
+        for i in range(count)
+    ]
+
+
+def _result(citation_id: str, verdict: str, score: float, mode: str = "tfidf"):
+    return AnalysisResult(
+        citation_id=citation_id,
+        verdict=verdict,
+        confidence_score=score,
+        analysis_mode=mode,
+    )
+
+
+def test_running_counters():
+    """Test that counters and score update as results arrive."""
+    aggregator = ReportAggregator(_citations(3))
+
+    aggregator.add(_result("c0", "supported", 90.0))
+    assert aggregator.verified_count == 1
+    assert aggregator.overall_score == 90.0
+
+    aggregator.add(_result("c1", "contradicted", 30.0))
+    aggregator.add(_result("c2", "insufficient_source", 60.0))
+    assert aggregator.verified_count == 1
+    assert aggregator.flagged_count == 1
+    assert aggregator.overall_score == 60.0
+    assert aggregator.progress()["analyzed_count"] == 3
+
+
+def test_replaced_result_updates_counters():
+    """Test that a new result for the same citation replaces the old one."""
+    aggregator = ReportAggregator(_citations(2))
+    aggregator.add(_result("c0", "contradicted", 20.0))
+    aggregator.add(_result("c1", "supported", 80.0))
+
+    aggregator.add(_result("c0", "supported", 100.0, mode="llm"))
+
+    assert aggregator.verified_count == 2
+    assert aggregator.flagged_count == 0
+    assert aggregator.overall_score == 90.0
+    assert aggregator.results["c0"].confidence_score == 100.0
+
+
+def test_partial_snapshot():
+    """Test that a partial report is a valid HallucinationReport."""
+    aggregator = ReportAggregator(_citations(4), analysis_mode="llm")
+    aggregator.add(_result("c2", "unrelated", 10.0, mode="llm"))
+
+    report = aggregator.snapshot()
+
+    assert report.total_citations == 4
+    assert report.flagged_count == 1
+    assert report.analysis_mode == "llm"
+    assert list(report.results) == ["c2"]
+
+
+def test_wait_returns_new_results():
+    """Test that subscribers receive results after their last seen index."""
+    aggregator = ReportAggregator(_citations(2))
+    aggregator.add(_result("c0", "supported", 90.0))
+
+    results, complete = aggregator.wait(0, timeout=0)
+    assert [r.citation_id for r in results] == ["c0"]
+    assert complete is False
+
+    timer = threading.Timer(0.05, aggregator.add, args=(_result("c1", "supported", 70.0),))
+    timer.start()
+    results, _ = aggregator.wait(1, timeout=5)
+    assert [r.citation_id for r in results] == ["c1"]
+
+    aggregator.close()
+    results, complete = aggregator.wait(2, timeout=5)
+    assert results == []
+    assert complete is True
+
+
+def test_close_records_time_once():
+    """Test that closing stamps the report once for eviction."""
+    aggregator = ReportAggregator(_citations(1))
+    assert aggregator.closed_at is None
+
+    aggregator.close()
+    closed_at = aggregator.closed_at
+    aggregator.close()
+
+    assert closed_at is not None
+    assert aggregator.closed_at == closed_at
+    assert aggregator.progress()["complete"] is True
+
+
+if __name__ == "__main__":
+    test_running_counters()
+    test_replaced_result_updates_counters()
+    test_partial_snapshot()
+    test_wait_returns_new_results()
+    test_close_records_time_once()
+    print("All report tests passed!")
@@ -0,0 +1,149 @@
+"""
+Unit tests for the verification scheduler.
+Run with: pytest tests/test_scheduler.py -v
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.common.scheduler import VerificationScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drain(scheduler):
+    """Dispatch and immediately finish lookups; return job IDs in order."""
+    order = []
+    while True:
+        lookup = scheduler.next_lookup()
+        if lookup is None:
+            return order
+        job, _ = lookup
+        order.append(job.job_id)
+        scheduler.release(job)
+
+
+def test_tenants_take_turns():
+    """Test that a large job does not block another tenant's small job."""
+    scheduler = VerificationScheduler(max_outstanding=4, clock=FakeClock())
+    big = scheduler.submit("big", "alice", range(100))
+    small = scheduler.submit("small", "bob", range(2))
+
+    order = _drain(scheduler)
+
+    assert order[:4] == ["big", "small", "big", "small"]
+    assert small.state == "done"
+    assert big.state == "done"
+    assert scheduler.jobs == {}
+
+
+def test_shortest_job_first_within_tenant():
+    """Test that a tenant's smaller job is served before its larger one."""
+    scheduler = VerificationScheduler(max_outstanding=4, clock=FakeClock())
+    scheduler.submit("long", "alice", range(5))
+    scheduler.submit("short", "alice", range(2))
+
+    order = _drain(scheduler)
+
+    assert order == ["short"] * 2 + ["long"] * 5
+
+
+def test_outstanding_cap():
+    """Test that no more than max_outstanding lookups run at once."""
+    scheduler = VerificationScheduler(max_outstanding=3, clock=FakeClock())
+    scheduler.submit("a", "alice", range(10))
+
+    running = [scheduler.next_lookup() for _ in range(5)]
+
+    assert sum(1 for lookup in running if lookup is not None) == 3
+    scheduler.release(running[0][0])
+    assert scheduler.next_lookup() is not None
+
+
+def test_deadline_and_abandonment_cancel_jobs():
+    """Test that expired and unwatched jobs are cancelled when reached."""
+    clock = FakeClock()
+    cancelled = []
+    scheduler = VerificationScheduler(
+        max_outstanding=10, abandon_after=30, clock=clock, on_cancel=cancelled.append
+    )
+    late = scheduler.submit("late", "alice", range(3), deadline=5)
+    gone = scheduler.submit("gone", "bob", range(3))
+    scheduler.submit("watched", "carol", range(3))
+
+    clock.now = 20
+    scheduler.touch("watched")
+    clock.now = 40
+    order = _drain(scheduler)
+
+    assert set(order) == {"watched"}
+    assert late.cancel_reason == "deadline exceeded"
+    assert gone.cancel_reason == "abandoned"
+    assert {job.job_id for job in cancelled} == {"late", "gone"}
+
+
+def test_expired_jobs_behind_the_head_are_cancelled():
+    """Test that jobs queued behind a tenant's head job still expire on time."""
+    clock = FakeClock()
+    cancelled = []
+    scheduler = VerificationScheduler(max_outstanding=1, clock=clock, on_cancel=cancelled.append)
+    head = scheduler.submit("head", "alice", range(2))
+    behind = scheduler.submit("behind", "alice", range(5), deadline=5)
+    lookup = scheduler.next_lookup()
+
+    clock.now = 10
+    assert scheduler.next_lookup() is None  # Slot still taken
+
+    assert behind.state == "cancelled"
+    assert cancelled == [behind]
+    assert "behind" not in scheduler.jobs
+    scheduler.release(lookup[0])
+    assert _drain(scheduler) == ["head"]
+    assert head.state == "done"
+
+
+def test_touch_postpones_abandonment():
+    """Test that a job touched after submission is not abandoned early."""
+    clock = FakeClock()
+    scheduler = VerificationScheduler(max_outstanding=10, abandon_after=30, clock=clock)
+    job = scheduler.submit("a", "alice", range(3))
+
+    clock.now = 25
+    scheduler.touch("a")
+    clock.now = 40
+    scheduler.next_lookup()
+
+    assert job.state == "running"
+
+
+def test_cancel_drops_queued_lookups():
+    """Test that a cancelled job gets no further lookups."""
+    cancelled = []
+    scheduler = VerificationScheduler(max_outstanding=10, clock=FakeClock(), on_cancel=cancelled.append)
+    scheduler.submit("a", "alice", range(5))
+    job, _ = scheduler.next_lookup()
+
+    assert scheduler.cancel("a") is True
+    assert scheduler.cancel("a") is False
+    assert scheduler.next_lookup() is None
+    scheduler.release(job)
+    assert job.state == "cancelled"
+    assert scheduler.outstanding == 0
+    assert cancelled == [job]
+
+
+if __name__ == "__main__":
+    test_tenants_take_turns()
+    test_shortest_job_first_within_tenant()
+    test_outstanding_cap()
+    test_deadline_and_abandonment_cancel_jobs()
+    test_expired_jobs_behind_the_head_are_cancelled()
+    test_touch_postpones_abandonment()
+    test_cancel_drops_queued_lookups()
+    print("All scheduler tests passed!")
@@ -0,0 +1,91 @@
+"""
+Unit tests for citation wire formats.
+Run with: pytest tests/test_wire.py -v
+"""
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.common.wire import (
+    WireFormat,
+    decode_citations,
+    encode_citations,
+    negotiate,
+    supported_formats,
+)
+from agents.parser.incremental import IncrementalParser
+
+
+TEXT = """
+According to recent research (doi:10.1234/test.2024), AI has made significant progress.
+The findings align with the study at https://example.org/ai-research/2024.
+For background, see the textbook ISBN 978-0-13-468599-1.
+Smith, J. A. (2020). The impact of AI on society. Journal of AI Research.
+"""
+
+
+def _parsed():
+    parser = IncrementalParser()
+    document = parser.parse(TEXT)
+    return document, parser.context_bounds(document)
+
+
+def test_all_formats_round_trip():
+    """Test that every available format decodes to the same citations."""
+    document, bounds = _parsed()
+    expected = [c.model_dump() for c in document.citations]
+
+    for wire_format in supported_formats():
+        data = encode_citations(document.citations, wire_format, document.text, bounds)
+        json.dumps(data)  # Must fit in a JSON DataPart
+        decoded = decode_citations(data)
+        assert [c.model_dump() for c in decoded] == expected, wire_format.token
+
+
+def test_full_format_is_unchanged():
+    """Test that the default format matches the original payload."""
+    document, _ = _parsed()
+
+    data = encode_citations(document.citations)
+
+    assert data == {"citations": [c.model_dump(mode="json") for c in document.citations]}
+
+
+def test_compact_formats_omit_nulls_and_share_context():
+    """Test that compact/columnar drop null fields and dedupe contexts."""
+    document, bounds = _parsed()
+
+    compact = encode_citations(document.citations, WireFormat("compact"), document.text, bounds)
+    columnar = encode_citations(document.citations, WireFormat("columnar"), document.text, bounds)
+
+    assert all(None not in row.values() for row in compact["citations"])
+    assert all(isinstance(row["context"], list) for row in compact["citations"])
+    # The short text's overlapping windows collapse into one shared segment
+    assert len(compact["segments"]) == 1
+    assert "isbn" in columnar["columns"]
+    assert len(json.dumps(columnar)) < len(json.dumps(encode_citations(document.citations)))
+
+
+def test_negotiate():
+    """Test format negotiation falls back to the first available format."""
+    assert negotiate(None).token == "full"
+    assert negotiate(["bogus", "columnar+gzip"]).token == "columnar+gzip"
+    assert negotiate(["application/vnd.citation-verifier.compact"]).token == "compact"
+    assert negotiate(["columnar+brotli"]).token == "full"
+
+
+def test_negotiate_ignores_malformed_accept():
+    """Test that client metadata of the wrong shape falls back to full JSON."""
+    assert negotiate("columnar+gzip").token == "full"
+    assert negotiate({"columnar": True}).token == "full"
+    assert negotiate([None, 3, {"a": 1}, "compact"]).token == "compact"
+
+
+if __name__ == "__main__":
+    test_all_formats_round_trip()
+    test_full_format_is_unchanged()
+    test_compact_formats_omit_nulls_and_share_context()
+    test_negotiate()
+    test_negotiate_ignores_malformed_accept()
+    print("All wire format tests passed!")